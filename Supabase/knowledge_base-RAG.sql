@@ -28,8 +28,11 @@ CREATE TABLE knowledge_base (
 );
 
 -- Indexes for knowledge_base table (optimized for vector search)
+-- The vector index is built over a half-precision (halfvec) expression: half the
+-- index size for the same 1536 dims, while the column keeps full precision.
+-- Requires pgvector >= 0.7.0. Queries must order by the same expression to use it.
 CREATE INDEX idx_kb_embedding ON knowledge_base 
-    USING ivfflat (embedding vector_cosine_ops) 
+    USING ivfflat ((embedding::halfvec(1536)) halfvec_cosine_ops) 
     WITH (lists = 100);
     
 CREATE INDEX idx_kb_source_type ON knowledge_base(source_type);
@@ -40,7 +43,9 @@ CREATE INDEX idx_kb_relevance_score ON knowledge_base(relevance_score DESC);
 CREATE INDEX idx_kb_last_accessed ON knowledge_base(last_accessed DESC);
 
 -- RPC function for general document matching using vector similarity
-CREATE OR REPLACE FUNCTION match_documents(query_embedding vector(1536), match_count int, filter_source text DEFAULT NULL)
+-- content_chars (optional) truncates content server-side so previews don't ship full documents
+DROP FUNCTION IF EXISTS match_documents(vector, int, text);
+CREATE OR REPLACE FUNCTION match_documents(query_embedding vector(1536), match_count int, filter_source text DEFAULT NULL, content_chars int DEFAULT NULL)
 RETURNS TABLE(
     id bigint,
     content text,
@@ -54,15 +59,16 @@ LANGUAGE sql
 AS $$
     SELECT
         knowledge_base.id,
-        knowledge_base.content,
+        CASE WHEN content_chars IS NULL THEN knowledge_base.content
+             ELSE left(knowledge_base.content, content_chars) END AS content,
         knowledge_base.content_hash,
         knowledge_base.source_type,
         knowledge_base.source_url,
         knowledge_base.title,
-        (knowledge_base.embedding <=> query_embedding) AS similarity
+        1 - (knowledge_base.embedding <=> query_embedding) AS similarity  -- cosine similarity (<=> is distance)
     FROM knowledge_base
     WHERE (filter_source IS NULL OR knowledge_base.source_type = filter_source)
-    ORDER BY knowledge_base.embedding <=> query_embedding
+    ORDER BY knowledge_base.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)  -- uses idx_kb_embedding
     LIMIT match_count;
 $$;
 
@@ -86,9 +92,9 @@ AS $$
         knowledge_base.source_type,
         knowledge_base.source_url,
         knowledge_base.title,
-        (knowledge_base.embedding <=> query_embedding) AS similarity
+        1 - (knowledge_base.embedding <=> query_embedding) AS similarity  -- cosine similarity (<=> is distance)
     FROM knowledge_base
     WHERE knowledge_base.source_type = query_document_type
-    ORDER BY knowledge_base.embedding <=> query_embedding
+    ORDER BY knowledge_base.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)  -- uses idx_kb_embedding
     LIMIT match_count;
 $$;
\ No newline at end of file
@@ -10,9 +10,16 @@ from backend.models.interaction import SearchRequest
 from backend.auth.security import verify_api_key_dependency
 from backend.core.dependencies import get_search_service
 
+# Serialize search payloads with orjson when it is installed
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as SearchResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as SearchResponse
+
 router = APIRouter(prefix="/search", tags=["search"])
 
-@router.post("/", dependencies=[Depends(verify_api_key_dependency)])
+@router.post("/", dependencies=[Depends(verify_api_key_dependency)], response_class=SearchResponse)
 async def search_endpoint(
     request: SearchRequest,
     search_service = Depends(get_search_service)
@@ -33,7 +40,8 @@ async def search_endpoint(
             max_results=request.max_results or 3
         )
         
-        return results
+        # Results are plain JSON types already, so skip jsonable_encoder and render directly
+        return SearchResponse(results)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
\ No newline at end of file
@@ -5,7 +5,7 @@ from functools import lru_cache
 from contextlib import asynccontextmanager
 import asyncio
 from fastapi import Depends, FastAPI
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from supabase import create_client, Client
 import httpx
 from httpx import Timeout
@@ -86,6 +86,7 @@ class ServiceContainer:
         logger.info("Initializing ServiceContainer...")
         self._supabase_client: Optional[Client] = None
         self._openai_client: Optional[OpenAI] = None
+        self._async_openai_client: Optional[AsyncOpenAI] = None  # For the async embedding path
         self._pubnub_client: Optional[PubNub] = None
         self._search_service: Optional[SearchService] = None
         self._vector_service: Optional[VectorStoreService] = None
@@ -116,6 +117,7 @@ class ServiceContainer:
             api_key = os.getenv("OPENAI_API_KEY")
             if api_key:
                 self._openai_client = OpenAI(api_key=api_key)
+                self._async_openai_client = AsyncOpenAI(api_key=api_key)
                 self._health_status["openai"] = {"status": "healthy", "error": None}
                 logger.info("OpenAI client initialized successfully")
             else:
@@ -204,8 +206,8 @@ class ServiceContainer:
         """Initialize SearchService."""
         try:
             if SEARCH_SERVICE_AVAILABLE:
-                # Get clients for SearchService
-                openai_client = self._openai_client
+                # Get clients for SearchService (it only uses OpenAI for embeddings)
+                openai_client = self._async_openai_client or self._openai_client
                 supabase_client = self._supabase_client
                 
                 self._search_service = SearchService(
@@ -226,7 +228,7 @@ class ServiceContainer:
         try:
             if VECTOR_SERVICE_AVAILABLE and self._openai_client and self._supabase_client:
                 self._vector_service = VectorStoreService(
-                    openai_client=self._openai_client,
+                    openai_client=self._async_openai_client or self._openai_client,
                     supabase_client=self._supabase_client
                 )
                 self._health_status["vector"] = {"status": "healthy", "error": None}
@@ -47,6 +47,12 @@ try:
 except ImportError:
     _register_health_check_endpoint = None
 
+# Shared search HTTP clients (closed on shutdown)
+try:
+    from backend.services.search_clients import close_http_clients
+except ImportError:
+    close_http_clients = None
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     # Create app instance
@@ -72,6 +78,10 @@ def create_app() -> FastAPI:
     app.include_router(logs.router)
     app.include_router(search.router)
     
+    # Close pooled search connections on shutdown
+    if close_http_clients:
+        app.add_event_handler("shutdown", close_http_clients)
+    
     # Register health check endpoint for Render
     if IS_RENDER:
         try:
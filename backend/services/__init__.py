@@ -55,6 +55,7 @@ __all__ = [
     "ResourcePool",
     "health_check_resource",
     "health_check_all_resources",
+    "health_check_all_resources_async",
 ]
 
 
@@ -5,8 +5,10 @@ Resource lifecycle management for ai_workbench components.
 
 import asyncio
 import logging
+import time
 import weakref
-from typing import Dict, Any, Optional, Callable, Set
+from collections import defaultdict, deque
+from typing import Dict, Any, Optional, Callable, Set, Tuple, NamedTuple
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -16,9 +18,18 @@ from .exceptions import ServiceInitializationError
 logger = logging.getLogger(__name__)
 
 
+class ResourceMeta(NamedTuple):
+    """Immutable information about a managed resource."""
+    name: str
+    resource: Any
+    resource_type: str
+    created_at: datetime
+    metadata: Dict[str, Any]
+
+
 @dataclass
 class ResourceInfo:
-    """Information about a managed resource."""
+    """Snapshot of information about a managed resource."""
     name: str
     resource: Any
     resource_type: str
@@ -33,9 +44,14 @@ class ResourceManager:
     
     def __init__(self):
         """Initialize resource manager."""
-        self.resources: Dict[str, ResourceInfo] = {}
+        self.resources: Dict[str, ResourceMeta] = {}
+        # Access bookkeeping kept outside ResourceMeta so lookups only touch two dict slots
+        self._last_access: Dict[str, float] = {}
+        self._access_count: Dict[str, int] = {}
         self.resource_finalizers: Dict[str, Callable] = {}
         self.dependency_graph: Dict[str, Set[str]] = {}
+        # Last suffix used per base name; persists across releases so probing resumes where it left off
+        self._name_counters: Dict[str, int] = defaultdict(int)
         logger.info("ResourceManager initialized")
     
     def register_resource(
@@ -61,22 +77,23 @@ class ResourceManager:
             Resource name (may be modified for uniqueness)
         """
         # Ensure unique name
-        original_name = name
-        counter = 1
-        while name in self.resources:
-            name = f"{original_name}_{counter}"
-            counter += 1
-        
-        # Create resource info
-        resource_info = ResourceInfo(
+        if name in self.resources:
+            counter = self._name_counters[name] + 1
+            while f"{name}_{counter}" in self.resources:
+                counter += 1
+            self._name_counters[name] = counter
+            name = f"{name}_{counter}"
+        
+        # Register resource
+        self.resources[name] = ResourceMeta(
             name=name,
             resource=resource,
             resource_type=resource_type,
+            created_at=datetime.utcnow(),
             metadata=metadata or {}
         )
-        
-        # Register resource
-        self.resources[name] = resource_info
+        self._last_access[name] = time.time()
+        self._access_count[name] = 0
         
         # Register finalizer if provided
         if finalizer:
@@ -98,12 +115,12 @@ class ResourceManager:
         Returns:
             The resource, or None if not found
         """
-        if name in self.resources:
-            resource_info = self.resources[name]
-            resource_info.last_accessed = datetime.utcnow()
-            resource_info.access_count += 1
-            return resource_info.resource
-        return None
+        meta = self.resources.get(name)
+        if meta is None:
+            return None
+        self._last_access[name] = time.time()
+        self._access_count[name] += 1
+        return meta.resource
     
     def get_resource_info(self, name: str) -> Optional[ResourceInfo]:
         """Get information about a managed resource.
@@ -112,18 +129,29 @@ class ResourceManager:
             name: Name of the resource
             
         Returns:
-            ResourceInfo, or None if not found
+            ResourceInfo snapshot, or None if not found
         """
-        return self.resources.get(name)
+        meta = self.resources.get(name)
+        if meta is None:
+            return None
+        return ResourceInfo(
+            name=meta.name,
+            resource=meta.resource,
+            resource_type=meta.resource_type,
+            created_at=meta.created_at,
+            last_accessed=datetime.utcfromtimestamp(self._last_access[name]),
+            access_count=self._access_count[name],
+            metadata=meta.metadata
+        )
     
-    def list_resources(self, resource_type: Optional[str] = None) -> Dict[str, ResourceInfo]:
+    def list_resources(self, resource_type: Optional[str] = None) -> Dict[str, ResourceMeta]:
         """List all managed resources, optionally filtered by type.
         
         Args:
             resource_type: Optional resource type to filter by
             
         Returns:
-            Dictionary of resource names to ResourceInfo
+            Dictionary of resource names to ResourceMeta
         """
         if resource_type:
             return {
@@ -188,6 +216,8 @@ class ResourceManager:
         
         # Remove from resources
         resource_info = self.resources.pop(name)
+        self._last_access.pop(name, None)
+        self._access_count.pop(name, None)
         logger.info(f"Released resource: {name} (type: {resource_info.resource_type})")
         return True
     
@@ -256,8 +286,8 @@ class ResourceManager:
             
             # Access statistics
             stats["access_statistics"][name] = {
-                "access_count": info.access_count,
-                "last_accessed": info.last_accessed.isoformat()
+                "access_count": self._access_count[name],
+                "last_accessed": datetime.utcfromtimestamp(self._last_access[name]).isoformat()
             }
             
             # Creation times
@@ -301,8 +331,11 @@ class ResourcePool:
         self.resource_type = resource_type
         self.factory = factory
         self.max_size = max_size
-        self.pool: list = []
-        self.in_use: Dict[Any, datetime] = {}
+        self.pool: deque = deque()
+        # Keyed by id() so pooled objects need not be hashable; values hold (resource, acquired_at)
+        self.in_use: Dict[int, Tuple[Any, float]] = {}
+        # Registered resource_manager name for each pooled resource, by id()
+        self._resource_names: Dict[int, str] = {}
         self.lock = asyncio.Lock()
         logger.info(f"ResourcePool initialized for {resource_type} (max_size: {max_size})")
     
@@ -320,20 +353,25 @@ class ResourcePool:
         """
         async with self.lock:
             if self.pool:
-                resource = self.pool.pop()
-            else:
-                # Create new resource
-                resource = self.factory()
-                resource_manager.register_resource(
-                    f"{self.resource_type}_pool_{len(self.in_use)}",
-                    resource,
-                    self.resource_type,
-                    metadata={"pool_managed": True}
-                )
-            
-            self.in_use[resource] = datetime.utcnow()
-            logger.debug(f"Acquired resource from pool: {self.resource_type}")
-            return resource
+                resource = self.pool.popleft()
+                self.in_use[id(resource)] = (resource, time.monotonic())
+                logger.debug(f"Acquired resource from pool: {self.resource_type}")
+                return resource
+        
+        # Create new resource outside the lock so a slow factory does not
+        # serialize acquires that can be served from the pool
+        resource = self.factory()
+        async with self.lock:
+            self._resource_names[id(resource)] = resource_manager.register_resource(
+                f"{self.resource_type}_pool_{len(self.in_use)}",
+                resource,
+                self.resource_type,
+                metadata={"pool_managed": True}
+            )
+            self.in_use[id(resource)] = (resource, time.monotonic())
+        
+        logger.debug(f"Created new pooled resource: {self.resource_type}")
+        return resource
     
     async def release(self, resource: Any):
         """Return a resource to the pool.
@@ -342,23 +380,20 @@ class ResourcePool:
             resource: Resource to return to the pool
         """
         async with self.lock:
-            if resource in self.in_use:
-                del self.in_use[resource]
-                
-                if len(self.pool) < self.max_size:
-                    self.pool.append(resource)
-                    logger.debug(f"Returned resource to pool: {self.resource_type}")
-                else:
-                    # Pool is full, release the resource
-                    resource_name = None
-                    for name, info in resource_manager.list_resources(self.resource_type).items():
-                        if info.resource is resource:
-                            resource_name = name
-                            break
-                    
-                    if resource_name:
-                        resource_manager.release_resource(resource_name)
-                        logger.debug(f"Pool full, released resource: {self.resource_type}")
+            if self.in_use.pop(id(resource), None) is None:
+                return
+            
+            if len(self.pool) < self.max_size:
+                self.pool.append(resource)
+                logger.debug(f"Returned resource to pool: {self.resource_type}")
+                return
+            
+            resource_name = self._resource_names.pop(id(resource), None)
+        
+        # Pool is full, release the resource outside the lock
+        if resource_name:
+            resource_manager.release_resource(resource_name)
+            logger.debug(f"Pool full, released resource: {self.resource_type}")
     
     def get_pool_statistics(self) -> Dict[str, Any]:
         """Get statistics about the pool.
@@ -376,55 +411,83 @@ class ResourcePool:
 
 
 # Health check utilities for resources
-def health_check_resource(name: str, resource: Any) -> Dict[str, Any]:
+# Marker for probes that do not report details
+_NO_DETAILS = object()
+
+# Resolved health probe per resource type, so the attribute ladder is only walked once
+_health_probe_cache: Dict[type, Callable[[Any], Tuple[str, Any]]] = {}
+
+
+def _make_attribute_probe(attr: str, is_callable: bool, with_details: bool) -> Callable[[Any], Tuple[str, Any]]:
+    """Build a probe that reads (or calls) a health attribute."""
+    def probe(resource: Any) -> Tuple[str, Any]:
+        value = getattr(resource, attr)
+        if is_callable:
+            value = value()
+        return ("healthy" if value else "unhealthy"), (value if with_details else _NO_DETAILS)
+    return probe
+
+
+def _ping_probe(resource: Any) -> Tuple[str, Any]:
+    resource.ping()
+    return "healthy", _NO_DETAILS
+
+
+def _exists_probe(resource: Any) -> Tuple[str, Any]:
+    return "exists", _NO_DETAILS
+
+
+def _resolve_probe(resource: Any) -> Callable[[Any], Tuple[str, Any]]:
+    """Determine how to health check a resource based on common patterns.
+    
+    Args:
+        resource: The resource to inspect
+        
+    Returns:
+        Probe returning a (status, details) tuple for resources of this type
+    """
+    if hasattr(resource, 'ping'):
+        return _ping_probe
+    
+    # health, is_alive and status may each be a property or a method
+    for attr, with_details in (("health", True), ("is_alive", False), ("status", True)):
+        if hasattr(resource, attr):
+            return _make_attribute_probe(attr, callable(getattr(resource, attr)), with_details)
+    
+    # Basic existence check
+    return _exists_probe
+
+
+def health_check_resource(name: str, resource: Any, timestamp: Optional[str] = None) -> Dict[str, Any]:
     """Perform a basic health check on a resource.
     
     Args:
         name: Name of the resource
         resource: The resource to check
+        timestamp: Optional ISO timestamp to report (shared across a batch of checks)
         
     Returns:
         Dictionary with health check results
     """
+    if timestamp is None:
+        timestamp = datetime.utcnow().isoformat()
+    
     try:
-        # Try to determine resource health based on common patterns
         health_status = {
             "resource": name,
             "status": "unknown",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": timestamp
         }
         
-        # Check for common health indicators
-        if hasattr(resource, 'ping'):
-            # Try ping method
-            resource.ping()
-            health_status["status"] = "healthy"
-        elif hasattr(resource, 'health'):
-            # Try health property or method
-            if callable(getattr(resource, 'health')):
-                health = resource.health()
-            else:
-                health = getattr(resource, 'health')
-            health_status["status"] = "healthy" if health else "unhealthy"
-            health_status["details"] = health
-        elif hasattr(resource, 'is_alive'):
-            # Try is_alive method or property
-            if callable(getattr(resource, 'is_alive')):
-                alive = resource.is_alive()
-            else:
-                alive = getattr(resource, 'is_alive')
-            health_status["status"] = "healthy" if alive else "unhealthy"
-        elif hasattr(resource, 'status'):
-            # Try status property or method
-            if callable(getattr(resource, 'status')):
-                status = resource.status()
-            else:
-                status = getattr(resource, 'status')
-            health_status["status"] = "healthy" if status else "unhealthy"
-            health_status["details"] = status
-        else:
-            # Basic existence check
-            health_status["status"] = "exists"
+        resource_type = type(resource)
+        probe = _health_probe_cache.get(resource_type)
+        if probe is None:
+            probe = _health_probe_cache.setdefault(resource_type, _resolve_probe(resource))
+        
+        status, details = probe(resource)
+        health_status["status"] = status
+        if details is not _NO_DETAILS:
+            health_status["details"] = details
             
         logger.debug(f"Health check for resource {name}: {health_status['status']}")
         return health_status
@@ -434,12 +497,37 @@ def health_check_resource(name: str, resource: Any) -> Dict[str, Any]:
             "resource": name,
             "status": "unhealthy",
             "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": timestamp
         }
         logger.error(f"Health check failed for resource {name}: {e}")
         return health_status
 
 
+def _health_check_error(name: str, error: BaseException, timestamp: str) -> Dict[str, Any]:
+    """Build the result entry for a health check that could not be run."""
+    logger.error(f"Error running health check for resource {name}: {error}")
+    return {
+        "resource": name,
+        "status": "error",
+        "error": f"Failed to run health check: {str(error)}",
+        "timestamp": timestamp
+    }
+
+
+def _overall_health_status(results: Dict[str, Dict[str, Any]], timestamp: str) -> Dict[str, Any]:
+    """Aggregate individual resource health checks into an overall status."""
+    all_healthy = all(result["status"] in ["healthy", "exists"] for result in results.values())
+    
+    overall_status = {
+        "status": "healthy" if all_healthy else "unhealthy",
+        "resources": results,
+        "timestamp": timestamp
+    }
+    
+    logger.info(f"Overall resource health check status: {overall_status['status']}")
+    return overall_status
+
+
 def health_check_all_resources() -> Dict[str, Any]:
     """Perform health checks on all managed resources.
     
@@ -447,29 +535,43 @@ def health_check_all_resources() -> Dict[str, Any]:
         Dictionary with overall health status and individual resource statuses
     """
     results = {}
-    all_healthy = True
+    timestamp = datetime.utcnow().isoformat()
     
     for name, info in resource_manager.list_resources().items():
         try:
-            result = health_check_resource(name, info.resource)
-            results[name] = result
-            if result["status"] not in ["healthy", "exists"]:
-                all_healthy = False
+            results[name] = health_check_resource(name, info.resource, timestamp)
         except Exception as e:
-            results[name] = {
-                "resource": name,
-                "status": "error",
-                "error": f"Failed to run health check: {str(e)}",
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            all_healthy = False
-            logger.error(f"Error running health check for resource {name}: {e}")
+            results[name] = _health_check_error(name, e, timestamp)
     
-    overall_status = {
-        "status": "healthy" if all_healthy else "unhealthy",
-        "resources": results,
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return _overall_health_status(results, timestamp)
+
+
+async def health_check_all_resources_async() -> Dict[str, Any]:
+    """Perform health checks on all managed resources concurrently.
     
-    logger.info(f"Overall resource health check status: {overall_status['status']}")
-    return overall_status
\ No newline at end of file
+    Probes run in the default executor, so blocking network checks
+    (e.g. client pings) overlap instead of running one after another.
+    
+    Returns:
+        Dictionary with overall health status and individual resource statuses
+    """
+    loop = asyncio.get_running_loop()
+    resources = resource_manager.list_resources()
+    timestamp = datetime.utcnow().isoformat()
+    
+    outcomes = await asyncio.gather(
+        *(
+            loop.run_in_executor(None, health_check_resource, name, info.resource, timestamp)
+            for name, info in resources.items()
+        ),
+        return_exceptions=True
+    )
+    
+    results = {}
+    for name, outcome in zip(resources, outcomes):
+        if isinstance(outcome, BaseException):
+            results[name] = _health_check_error(name, outcome, timestamp)
+        else:
+            results[name] = outcome
+    
+    return _overall_health_status(results, timestamp)
@@ -50,12 +50,14 @@ class RetryConfig:
         self.retry_on_exceptions = retry_on_exceptions
 
 
-def calculate_delay(attempt: int, config: RetryConfig) -> float:
+def calculate_delay(attempt: int, config: RetryConfig, exc: Optional[BaseException] = None) -> float:
     """Calculate delay with exponential backoff and optional jitter.
     
     Args:
         attempt: Current attempt number (1-indexed)
         config: Retry configuration
+        exc: Exception that triggered the retry; a ``retry_after`` hint
+            (e.g. from RateLimitError) is used as a lower bound
         
     Returns:
         Delay in seconds
@@ -70,6 +72,12 @@ def calculate_delay(attempt: int, config: RetryConfig) -> float:
     if config.jitter:
         delay = delay * (0.5 + random.random() * 0.5)  # 0.5 to 1.0 multiplier
     
+    # Honor server-provided retry hints (rate limit errors)
+    if exc is not None:
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after:
+            delay = max(delay, retry_after)
+    
     return delay
 
 
@@ -102,16 +110,12 @@ def retry_with_backoff(config: Optional[RetryConfig] = None):
                         raise
                     
                     # Calculate and apply delay
-                    delay = calculate_delay(attempt, config)
+                    delay = calculate_delay(attempt, config, e)
                     logger.warning(
                         f"Attempt {attempt} of {func.__name__} failed: {e}. "
                         f"Retrying in {delay:.2f} seconds..."
                     )
                     
-                    # Handle rate limit errors specially
-                    if isinstance(e, RateLimitError) and e.retry_after:
-                        delay = max(delay, e.retry_after)
-                    
                     await asyncio.sleep(delay)
             
             # This should never be reached due to the re-raise above
@@ -133,16 +137,12 @@ def retry_with_backoff(config: Optional[RetryConfig] = None):
                         raise
                     
                     # Calculate and apply delay
-                    delay = calculate_delay(attempt, config)
+                    delay = calculate_delay(attempt, config, e)
                     logger.warning(
                         f"Attempt {attempt} of {func.__name__} failed: {e}. "
                         f"Retrying in {delay:.2f} seconds..."
                     )
                     
-                    # Handle rate limit errors specially
-                    if isinstance(e, RateLimitError) and e.retry_after:
-                        delay = max(delay, e.retry_after)
-                    
                     time.sleep(delay)
             
             # This should never be reached due to the re-raise above
@@ -220,16 +220,12 @@ def retry_sync_operation(
                 raise
             
             # Calculate and apply delay
-            delay = calculate_delay(attempt, config)
+            delay = calculate_delay(attempt, config, e)
             logger.warning(
                 f"Attempt {attempt} of {operation.__name__} failed: {e}. "
                 f"Retrying in {delay:.2f} seconds..."
             )
             
-            # Handle rate limit errors specially
-            if isinstance(e, RateLimitError) and e.retry_after:
-                delay = max(delay, e.retry_after)
-            
             time.sleep(delay)
     
     # This should never be reached due to the re-raise above
@@ -273,16 +269,12 @@ async def retry_async_operation(
                 raise
             
             # Calculate and apply delay
-            delay = calculate_delay(attempt, config)
+            delay = calculate_delay(attempt, config, e)
             logger.warning(
                 f"Attempt {attempt} of {operation.__name__} failed: {e}. "
                 f"Retrying in {delay:.2f} seconds..."
             )
             
-            # Handle rate limit errors specially
-            if isinstance(e, RateLimitError) and e.retry_after:
-                delay = max(delay, e.retry_after)
-            
             await asyncio.sleep(delay)
     
     # This should never be reached due to the re-raise above
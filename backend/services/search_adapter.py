@@ -4,10 +4,11 @@ Adapter that integrates the external search service with the backend dependency
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional
 
 # Import the existing search components
 from backend.services.search_service import SearchService
+from backend.utils.query_processing import resolve_search_source
 
 logger = logging.getLogger(__name__)
 
@@ -47,20 +48,10 @@ class SearchAdapter:
         logger.info(f"Performing smart search: {query[:50]}...")
         
         try:
-            # Map context to source if needed (similar to SmartSearchTool)
-            if source is None and context != "all":
-                source_mapping = {
-                    "error": "stackoverflow",
-                    "code_example": "github",
-                    "documentation": "official_doc",
-                    "best_practice": "official_doc"
-                }
-                source = source_mapping.get(context)
-            
-            # Use the search service's smart_search method with correct parameters
+            # An explicit source wins; otherwise use the source implied by the context
             result = await self.search_service.smart_search(
                 query=query,
-                source=source or "all",
+                source=resolve_search_source(context, source),
                 max_results=max_total_results
             )
             
@@ -68,7 +59,8 @@ class SearchAdapter:
             return result
             
         except Exception as e:
-            logger.error(f"Error during smart search: {e}", exc_info=True)
+            logger.error("Error during smart search: %s", e)
+            logger.debug("Smart search traceback", exc_info=True)
             return {
                 "results": [],
                 "error": str(e),
@@ -2,23 +2,112 @@
 
 import os
 import re
+import sys
 import html
+import time
 import asyncio
 import hashlib
 import httpx
 import tenacity
+from collections import OrderedDict
 from httpx import Limits
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple, AsyncIterator
 from dataclasses import dataclass, field
-from bs4 import BeautifulSoup
 
-# Import async-aware caching decorator
-from backend.utils.caching import cached
+# Optional DOM parser for the HTML cleaner; the regex cleaner is used without it
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Optional incremental JSON parser for streaming large API responses
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
-# Global rate limiting configuration for all HTTP clients
+# Optional fast JSON decoder for API responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# HTTP/2 needs the h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+# Import async-aware caching decorator and the shared cache it writes to
+from backend.utils.caching import cached, get_cache
+from backend.services.exceptions import RateLimitError
+
+# Connection pool limits for the shared HTTP clients. Per-host concurrency is
+# enforced by each client's admission control, so the pool only needs to be
+# large enough never to queue requests that admission already let through.
 GLOBAL_LIMITS = Limits(
-    max_keepalive_connections=10,
-    max_connections=50
+    max_keepalive_connections=50,
+    max_connections=200,
+    keepalive_expiry=30.0
+)
+
+# GitHub fans each search out into three subqueries, so keep more warm connections
+GITHUB_LIMITS = Limits(
+    max_keepalive_connections=64,
+    max_connections=200,
+    keepalive_expiry=30.0
+)
+
+# Upper bound on HTML handed to the parser, to cap worst-case cost on huge bodies
+MAX_HTML_PARSE_CHARS = 200_000
+
+# Above this many characters of HTML per page, cleaning runs in a worker thread
+# instead of on the event loop
+CLEAN_IN_THREAD_MIN_CHARS = 100_000
+
+# Elements dropped (with their content) before extracting text: code blocks are
+# often long and non-searchable, scripts and styles are never prose
+_STRIP_TAGS = ["code", "script", "style"]
+
+# Regex cleaner patterns: any tag, and whether a tag opens or closes a stripped element.
+# Tags never span a '<', which keeps matching linear on stray unescaped brackets.
+_TAG_RE = re.compile(r"<[^<>]*>")
+_STRIP_TAG_RE = re.compile(r"<(/?)(?:%s)\b" % "|".join(_STRIP_TAGS), re.IGNORECASE)
+
+
+def _html_text(body_html: str) -> str:
+    """Drop tags, and stripped elements with their content, in one linear pass.
+    
+    An element that is never closed is dropped up to the end of the body, as an
+    HTML parser would, rather than rescanning the rest of the body for each tag.
+    """
+    parts: List[str] = []
+    depth = 0
+    pos = 0
+    for tag in _TAG_RE.finditer(body_html):
+        if not depth:
+            parts.append(body_html[pos:tag.start()])
+        pos = tag.end()
+        strip = _STRIP_TAG_RE.match(tag.group())
+        if strip is None:
+            continue
+        if strip.group(1):
+            depth = max(depth - 1, 0)
+        elif not tag.group().endswith("/>"):
+            depth += 1
+    if not depth:
+        parts.append(body_html[pos:])
+    return " ".join(parts)
+
+# Collapses whitespace runs left inside text nodes (newlines, indentation, nbsp)
+_WS_RE = re.compile(r"\s+")
+
+# Clean HTML with a full DOM parse instead of regexes (slower, but robust to malformed
+# markup such as nested <code> blocks); needs selectolax
+USE_DOM_HTML_CLEANER = (
+    LexborHTMLParser is not None
+    and os.getenv("USE_DOM_HTML_CLEANER", "false").lower() == "true"
 )
 
 # Standard User-Agent for all requests
@@ -29,7 +118,6 @@ try:
     from backend.utils import save_log
 except ImportError:
     # Fallback: if running from search module context
-    import sys
     if 'backend' in sys.modules or 'backend.utils' in sys.modules:
         from backend.utils import save_log
     else:
@@ -39,16 +127,49 @@ except ImportError:
 
 
 # ==================== Retry Helper ====================
+# Statuses worth retrying; other 4xx responses (bad query, auth) fail the same way again
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Longest Retry-After we are willing to sleep for inside a single search. Retries
+# sleep while holding the client's admission slot (and GitHub's rate-limit tokens),
+# so a longer wait fails the request instead of starving other searches.
+MAX_RETRY_AFTER_SECONDS = 5.0
+
+_exponential_wait = tenacity.wait_exponential(multiplier=1, min=1, max=10)
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Return a numeric Retry-After from an HTTP error response, if any."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        retry_after = exc.response.headers.get("Retry-After", "").strip()
+        if retry_after.isdigit():
+            return float(retry_after)
+    return None
+
+
+def _is_transient_http_error(exc: BaseException) -> bool:
+    """Return True for connection problems and transient HTTP statuses worth waiting for."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        if exc.response.status_code not in RETRYABLE_STATUS_CODES:
+            return False
+        retry_after = _retry_after(exc)
+        return retry_after is None or retry_after <= MAX_RETRY_AFTER_SECONDS
+    return isinstance(exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+
+def _wait_retry_after(retry_state: tenacity.RetryCallState) -> float:
+    """Honor a numeric Retry-After header, falling back to exponential backoff."""
+    retry_after = _retry_after(retry_state.outcome.exception())
+    if retry_after is not None:
+        return retry_after
+    return _exponential_wait(retry_state)
+
+
 def _make_retry_decorator():
     """Create a retry decorator for HTTP requests with exponential backoff."""
     return tenacity.retry(
-        retry=tenacity.retry_if_exception_type((
-            httpx.HTTPStatusError,
-            httpx.ReadTimeout,
-            httpx.ConnectError,
-            httpx.NetworkError
-        )),
-        wait=tenacity.wait_exponential(multiplier=1, min=1, max=10),
+        retry=tenacity.retry_if_exception(_is_transient_http_error),
+        wait=_wait_retry_after,
         stop=tenacity.stop_after_attempt(3),
         reraise=True,
         before_sleep=lambda retry_state: save_log(
@@ -61,7 +182,277 @@ def _make_retry_decorator():
 HTTP_RETRY = _make_retry_decorator()
 
 
-@dataclass
+# ==================== Shared HTTP Clients ====================
+# One client per host profile, reused across searches so keep-alive connections
+# and TLS sessions are amortized. Created lazily so they bind to the running loop,
+# and recreated if a later search runs on a different loop (e.g. scripts calling
+# asyncio.run() per query), since pooled connections cannot cross event loops.
+_http_clients: Dict[str, Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+
+def _get_http_client(name: str, factory: Callable[[], httpx.AsyncClient]) -> httpx.AsyncClient:
+    """Get or create the shared HTTP client for a host profile on the running loop.
+    
+    Creation never awaits, so concurrent first calls cannot race and no lock is needed.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _http_clients.get(name)
+    if entry is not None:
+        client, client_loop = entry
+        if client_loop is loop and not client.is_closed:
+            return client
+    client = factory()
+    _http_clients[name] = (client, loop)
+    return client
+
+async def close_http_clients() -> None:
+    """Close all shared HTTP clients (call on application shutdown)."""
+    loop = asyncio.get_running_loop()
+    entries = list(_http_clients.values())
+    _http_clients.clear()
+    for client, client_loop in entries:
+        # Clients from an earlier, finished loop cannot be closed from this one
+        if client_loop is loop:
+            await client.aclose()
+
+
+# ==================== Admission Control ====================
+class _Admission:
+    """Resizable concurrency limit for one API host.
+    
+    Works like an asyncio.Semaphore, but the limit can be changed at runtime:
+    it is halved when the host rate-limits us and grows back by one on each
+    clean request, up to the configured maximum.
+    """
+    
+    def __init__(self, cmax: int) -> None:
+        """Initialize with the maximum number of concurrent requests."""
+        self.limit = cmax
+        self.cmax = cmax
+        self.active = 0
+        # Created lazily on the running loop, and rebuilt if a later caller runs on
+        # another loop (e.g. scripts calling asyncio.run() per query)
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond = asyncio.Condition()
+            self._loop = loop
+            # Slots held on the old loop died with it
+            self.active = 0
+        return self._cond
+    
+    async def __aenter__(self) -> "_Admission":
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.active < self.cmax)
+            self.active += 1
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        cond = self._condition()
+        async with cond:
+            self.active -= 1
+            cond.notify(1)
+    
+    async def set_cmax(self, n: int) -> None:
+        """Change the concurrency limit, waking waiters if it grew."""
+        cond = self._condition()
+        async with cond:
+            self.cmax = max(1, min(n, self.limit))
+            cond.notify_all()
+    
+    async def backoff(self) -> None:
+        """Halve the concurrency limit after a rate-limit response."""
+        if self.cmax > 1:
+            await self.set_cmax(self.cmax // 2)
+    
+    async def recover(self) -> None:
+        """Raise the concurrency limit by one after a successful request."""
+        if self.cmax < self.limit:
+            await self.set_cmax(self.cmax + 1)
+
+
+# Process-wide limits shared by every client instance, so creating extra clients
+# (tests, ad-hoc scripts, SearchService's own instances) cannot multiply them
+_SO_ADMISSION = _Admission(5)  # Max 5 concurrent SO requests
+_GITHUB_ADMISSION = _Admission(3)  # Max 3 concurrent GitHub requests (strict rate limit)
+
+
+class _TokenBucket:
+    """Request-rate limit for one API host.
+    
+    Admission control bounds how many requests are in flight; the bucket bounds
+    how many start per time window. Tokens are reserved as soon as they are asked
+    for, so callers queue in arrival order, and a caller that would have to
+    wait longer than ``max_wait`` is refused instead of piling on.
+    """
+    
+    def __init__(self, rate: Callable[[], int], per: float, max_wait: float = 10.0) -> None:
+        """Allow ``rate()`` requests per ``per`` seconds, bursting up to that many.
+        
+        ``rate`` is resolved on first use rather than at import, so it can depend
+        on configuration (e.g. environment variables) loaded after this module.
+        """
+        self._rate = rate
+        self.per = per
+        self.max_wait = max_wait
+        self.capacity = 0.0
+        self.fill_rate = 0.0
+        self.tokens = 0.0
+        self.updated = 0.0
+        self._sized = False
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if not self._sized:
+            rate = self._rate()
+            self.capacity = self.tokens = float(rate)
+            self.fill_rate = rate / self.per
+            self._sized = True
+        else:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+    
+    async def acquire(self, service: str, n: int = 1) -> None:
+        """Take ``n`` tokens, sleeping until they are due.
+        
+        Raises:
+            RateLimitError: If the tokens would not be available within max_wait
+        """
+        self._refill()
+        wait = (n - self.tokens) / self.fill_rate if self.tokens < n else 0.0
+        if wait > self.max_wait:
+            raise RateLimitError(service, retry_after=int(wait) + 1)
+        self.tokens -= n
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Nothing was sent, so the reservation goes back to the bucket
+                self.refund(n)
+                raise
+    
+    def refund(self, n: int = 1) -> None:
+        """Return ``n`` reserved tokens whose requests were never sent."""
+        if n > 0:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + n)
+
+
+# GitHub's search API allows 30 requests/minute with a token and 10 without; every
+# GitHubClient.search spends up to three (code, repositories, issues)
+_GITHUB_SEARCH_RATE = _TokenBucket(lambda: 30 if os.getenv("GITHUB_TOKEN") else 10, 60.0)
+
+
+# ==================== JSON Decoding ====================
+def _response_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# ==================== Streaming JSON ====================
+class _AsyncByteReader:
+    """Adapt an async byte iterator to the async read() interface ijson expects."""
+    
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks.__aiter__()
+        self._buffer = b""
+    
+    async def read(self, n: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs str, so never consume on it
+        if n == 0:
+            return b""
+        while not self._buffer:
+            try:
+                self._buffer = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                return b""
+        if n < 0:
+            n = len(self._buffer)
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+
+# Responses at least this large (by Content-Length) are parsed while streaming
+GITHUB_STREAM_MIN_BYTES = 64 * 1024
+
+
+# Conditional GET cache: (url, params, limit) -> (ETag, items) for recent responses, so an
+# unchanged result page comes back as a body-less 304 (free on GitHub's rate limit)
+ETAG_CACHE_SIZE = 256
+_EtagKey = Tuple[str, Tuple[Tuple[str, Any], ...], Optional[int]]
+_etag_cache: "OrderedDict[_EtagKey, Tuple[str, List[Dict[str, Any]]]]" = OrderedDict()
+
+
+def _remember_etag(key: _EtagKey, response: httpx.Response, items: List[Dict[str, Any]]) -> None:
+    """Record the response's ETag and items for later conditional requests."""
+    etag = response.headers.get("ETag")
+    if not etag:
+        return
+    _etag_cache[key] = (etag, items)
+    _etag_cache.move_to_end(key)
+    if len(_etag_cache) > ETAG_CACHE_SIZE:
+        _etag_cache.popitem(last=False)
+
+
+@HTTP_RETRY
+async def _fetch_items(
+    client: httpx.AsyncClient,
+    url: str,
+    limit: Optional[int] = None,
+    stream_min_bytes: int = 0,
+    **kwargs: Any,
+) -> List[Dict[str, Any]]:
+    """Fetch the `items` array of a JSON search response, with retries.
+    
+    With ijson installed, a response whose Content-Length is at least
+    `stream_min_bytes` is parsed item by item as it arrives, stopping after
+    `limit` items, so the full payload is never materialized. Smaller responses
+    (or unknown lengths, unless `stream_min_bytes` is 0) are read and decoded whole.
+    
+    Requests are made conditional (If-None-Match) when an earlier response for
+    the same URL, params and limit carried an ETag.
+    """
+    # The limit is part of the key: a streamed page stops after `limit` items, so
+    # its cached items can only answer a 304 for the same limit
+    key = (url, tuple(sorted((kwargs.get("params") or {}).items())), limit)
+    cached = _etag_cache.get(key)
+    if cached is not None:
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "If-None-Match": cached[0]}
+    
+    async with client.stream("GET", url, **kwargs) as response:
+        if cached is not None and response.status_code == 304:
+            _etag_cache.move_to_end(key)
+            return cached[1][:limit]
+        response.raise_for_status()
+        length = response.headers.get("Content-Length", "")
+        size = int(length) if length.isdigit() else 0
+        
+        if ijson is None or size < stream_min_bytes:
+            await response.aread()
+            items = _response_json(response).get("items", [])
+            _remember_etag(key, response, items)
+            return items[:limit]
+        
+        items: List[Dict[str, Any]] = []
+        reader = _AsyncByteReader(response.aiter_bytes())
+        async for item in ijson.items_async(reader, "items.item", use_float=True):
+            items.append(item)
+            if limit is not None and len(items) >= limit:
+                break
+        _remember_etag(key, response, items)
+        return items
+
+
+# Slotted dataclasses need Python 3.10+; older runtimes get a regular dataclass
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Document:
     """Standardized document structure for content aggregation."""
     content: str
@@ -76,73 +467,92 @@ class StackOverflowClient:
     
     BASE_URL = "https://api.stackexchange.com/2.3/search/advanced"
     
-    def __init__(self):
-        """Initialize the client with a semaphore for concurrency control."""
-        self._semaphore = asyncio.Semaphore(5)  # Max 5 concurrent SO requests
+    def __init__(self) -> None:
+        """Initialize the client with the shared StackOverflow admission controller."""
+        self._admission = _SO_ADMISSION
+    
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Create the HTTP client shared by all StackOverflow searches."""
+        return httpx.AsyncClient(
+            timeout=15,
+            limits=GLOBAL_LIMITS,
+            http2=HTTP2_ENABLED,
+            headers={"User-Agent": USER_AGENT}
+        )
     
     def _clean_html(self, body_html: str) -> str:
-        """Robustly clean HTML content using BeautifulSoup."""
-        soup = BeautifulSoup(body_html, 'html.parser')
-        # Remove code blocks, which often contain non-searchable or overly long content
-        for code in soup.find_all('code'):
-            code.decompose()
-            
-        text = soup.get_text(separator=' ', strip=True)
-        return html.unescape(text)
+        """Reduce a StackOverflow body to plain text, dropping code blocks."""
+        body_html = body_html[:MAX_HTML_PARSE_CHARS]
+        if USE_DOM_HTML_CLEANER:
+            return self._clean_html_dom(body_html)
+        
+        text = _html_text(body_html)
+        return _WS_RE.sub(' ', html.unescape(text)).strip()
+    
+    def _clean_html_dom(self, body_html: str) -> str:
+        """Robustly clean HTML content using the selectolax Lexbor parser."""
+        tree = LexborHTMLParser(body_html)
+        tree.strip_tags(_STRIP_TAGS)
+        
+        if tree.body is None:
+            return ""
+        # The parser already decodes entities; unescaping again would corrupt
+        # literal text such as "&lt;" written by the post author
+        text = tree.body.text(separator=' ', strip=True)
+        return _WS_RE.sub(' ', text).strip()
+    
+    def _clean_bodies(self, bodies: List[str]) -> List[str]:
+        """Clean a batch of StackOverflow bodies (safe to run in a worker thread)."""
+        return [self._clean_html(body) for body in bodies]
     
-    @HTTP_RETRY
-    async def _fetch_with_retry(self, client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
-        """Make HTTP request with automatic retry on transient failures."""
-        response = await client.get(url, **kwargs)
-        response.raise_for_status()
-        return response
-
     async def search(self, query: str, max_results: int) -> List[Document]:
         """Asynchronously search StackOverflow with concurrency limits."""
-        async with self._semaphore:  # Enforce max 5 concurrent requests
-            params = {
-                "order": "desc",
-                "sort": "relevance",
-                "q": query,
-                "site": "stackoverflow",
-                "filter": "withbody",
-                "pagesize": max_results,
-            }
-            
-            async with httpx.AsyncClient(
-                timeout=15,
-                limits=GLOBAL_LIMITS,
-                headers={"User-Agent": USER_AGENT}
-            ) as client:
-                try:
-                    resp = await self._fetch_with_retry(client, self.BASE_URL, params=params)
-                    items = resp.json().get("items", [])
-                except httpx.HTTPError as e:
-                    save_log("ERROR", f"StackOverflow API request failed after retries: {e}", source="stackoverflow_client", component="search_client")
-                    return []
-                except Exception as e:
-                    save_log("ERROR", f"StackOverflow API unexpected error: {e}", source="stackoverflow_client", component="search_client")
-                    return []
-
+        params = {
+            "order": "desc",
+            "sort": "relevance",
+            "q": query,
+            "site": "stackoverflow",
+            "filter": "withbody",
+            "pagesize": max_results,
+        }
+        client = _get_http_client("stackoverflow", self._create_http_client)
+        
+        # Hold the admission slot for the HTTP fetch only; parsing happens after release
+        async with self._admission:  # Enforce max 5 concurrent requests
+            try:
+                items = await _fetch_items(client, self.BASE_URL, max_results, params=params)
+            except httpx.HTTPError as e:
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 429:
+                    await self._admission.backoff()
+                save_log("ERROR", f"StackOverflow API request failed after retries: {e}", source="stackoverflow_client", component="search_client")
+                return []
+            except Exception as e:
+                save_log("ERROR", f"StackOverflow API unexpected error: {e}", source="stackoverflow_client", component="search_client")
+                return []
+            await self._admission.recover()
+
+        # Data cleaning: one batch per page, off the event loop when the page is large
+        bodies = [item.get("body", "") for item in items]
+        if sum(map(len, bodies)) >= CLEAN_IN_THREAD_MIN_CHARS:
+            body_texts = await asyncio.to_thread(self._clean_bodies, bodies)
+        else:
+            body_texts = self._clean_bodies(bodies)
+        
         docs: List[Document] = []
-        for item in items:
-            title = item.get("title", "")
-            body_html = item.get("body", "")
-            
-            # Data cleaning
-            body_text = self._clean_html(body_html)
-            content = f"StackOverflow question: {title}\n\n{body_text}"
+        for item, body_text in zip(items, body_texts):
+            g = item.get
+            title = g("title", "")
             
             docs.append(Document(
-                content=content,
+                content=f"StackOverflow question: {title}\n\n{body_text}",
                 title=title,
                 source_type="stackoverflow",
-                source_url=item.get("link"),
+                source_url=g("link"),
                 metadata={
-                    "question_id": item.get("question_id"),
-                    "tags": item.get("tags", []),
-                    "is_answered": item.get("is_answered"),
-                    "score": item.get("score", 0),
+                    "question_id": g("question_id"),
+                    "tags": g("tags", []),
+                    "is_answered": g("is_answered"),
+                    "score": g("score", 0),
                 },
             ))
         return docs
@@ -152,195 +562,262 @@ class GitHubClient:
     
     BASE_URL = "https://api.github.com/search"
     
-    def __init__(self):
-        """Initialize the client with a semaphore for concurrency control."""
-        self._semaphore = asyncio.Semaphore(3)  # Max 3 concurrent GitHub requests (strict rate limit)
-    
-    def _get_headers(self) -> Dict[str, str]:
-        headers = {
+    def __init__(self) -> None:
+        """Initialize the client with the shared GitHub admission controller and request headers."""
+        self._admission = _GITHUB_ADMISSION
+        
+        self._headers: Dict[str, str] = {
             "Accept": "application/vnd.github+json",
             "User-Agent": USER_AGENT
         }
         gh_token = os.getenv("GITHUB_TOKEN")
         if gh_token:
-            headers["Authorization"] = f"token {gh_token}"
-        return headers
+            self._headers["Authorization"] = f"token {gh_token}"
     
-    @HTTP_RETRY
-    async def _fetch_with_retry(self, client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
-        """Make HTTP request with automatic retry on transient failures."""
-        response = await client.get(url, **kwargs)
-        response.raise_for_status()
-        return response
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Create the HTTP client shared by all GitHub searches."""
+        return httpx.AsyncClient(
+            timeout=10,
+            limits=GITHUB_LIMITS,
+            http2=HTTP2_ENABLED,
+            headers=self._headers
+        )
+    
+    def _parse_code_item(self, item: Dict[str, Any]) -> Document:
+        """Build a Document from a code search result."""
+        g = item.get
+        repo = g("repository", {})
+        path = g("path")
+        title = f"{g('name')} in {repo.get('full_name', 'unknown')}"
+        url = g("html_url", "")
+        return Document(
+            content=f"GitHub code: {title}\n\nPath: {path}\n\nURL: {url}",
+            title=title,
+            source_type="github",
+            source_url=url,
+            metadata={
+                "type": "code",
+                "language": g("language"),
+                "path": path,
+                "repository": repo.get("full_name"),
+            },
+        )
+
+    def _parse_repo_item(self, item: Dict[str, Any]) -> Document:
+        """Build a Document from a repository search result."""
+        g = item.get
+        title = g("full_name", "unknown_repo")
+        url = g("html_url", "")
+        return Document(
+            content=f"GitHub repo: {title}\n\nDescription: {g('description', 'N/A')}\n\nURL: {url}",
+            title=title,
+            source_type="github",
+            source_url=url,
+            metadata={
+                "type": "repository",
+                "stars": g("stargazers_count", 0),
+                "language": g("language"),
+                "description": g("description"),
+            },
+        )
+
+    def _parse_issue_item(self, item: Dict[str, Any]) -> Document:
+        """Build a Document from an issue/PR search result."""
+        g = item.get
+        title = g("title", "unknown_issue")
+        url = g("html_url", "")
+        return Document(
+            content=f"GitHub issue: {title}\n\nBody: {g('body', 'N/A')}\n\nURL: {url}",
+            title=title,
+            source_type="github",
+            source_url=url,
+            metadata={
+                "type": "issue",
+                "state": g("state"),
+                "score": g("score", 0),
+            },
+        )
 
     async def search(self, query: str, max_results: int) -> List[Document]:
         """Asynchronously search GitHub (repositories, issues, code) with concurrency limits."""
-        async with self._semaphore:  # Enforce max 3 concurrent requests
-            headers = self._get_headers()
-            docs: List[Document] = []
-
-            # Search across multiple types: code, repositories, and issues
-            search_types = [
-                ("code", f"{self.BASE_URL}/code"),
-                ("repositories", f"{self.BASE_URL}/repositories"),
-                ("issues", f"{self.BASE_URL}/issues"),
-            ]
-
-            async with httpx.AsyncClient(
-                timeout=10,
-                limits=GLOBAL_LIMITS,
-                headers=headers
-            ) as client:
-                for search_type, endpoint in search_types:
-                    try:
-                        # Build query with sort for relevance
-                        params = {
-                            "q": query,
-                            "per_page": max(3, max_results // 3),  # Split results across 3 types
-                            "sort": "stars" if search_type == "repositories" else "relevance",
-                        }
-                        
-                        r = await self._fetch_with_retry(client, endpoint, params=params)
-                        items = r.json().get("items", [])
-                        
-                        for item in items:
-                            if search_type == "code":
-                                # Code search result
-                                title = f"{item.get('name')} in {item.get('repository', {}).get('full_name', 'unknown')}"
-                                url = item.get("html_url", "")
-                                content = f"GitHub code: {title}\n\nPath: {item.get('path')}\n\nURL: {url}"
-                                docs.append(Document(
-                                    content=content,
-                                    title=title,
-                                    source_type="github",
-                                    source_url=url,
-                                    metadata={
-                                        "type": "code",
-                                        "language": item.get("language"),
-                                        "path": item.get("path"),
-                                        "repository": item.get("repository", {}).get("full_name"),
-                                    },
-                                ))
-                            elif search_type == "repositories":
-                                # Repository search result
-                                title = item.get("full_name", "unknown_repo")
-                                url = item.get("html_url", "")
-                                content = f"GitHub repo: {title}\n\nDescription: {item.get('description', 'N/A')}\n\nURL: {url}"
-                                docs.append(Document(
-                                    content=content,
-                                    title=title,
-                                    source_type="github",
-                                    source_url=url,
-                                    metadata={
-                                        "type": "repository",
-                                        "stars": item.get("stargazers_count", 0),
-                                        "language": item.get("language"),
-                                        "description": item.get("description"),
-                                    },
-                                ))
-                            else:  # issues
-                                # Issue/PR search result
-                                title = item.get("title", "unknown_issue")
-                                url = item.get("html_url", "")
-                                content = f"GitHub issue: {title}\n\nBody: {item.get('body', 'N/A')}\n\nURL: {url}"
-                                docs.append(Document(
-                                    content=content,
-                                    title=title,
-                                    source_type="github",
-                                    source_url=url,
-                                    metadata={
-                                        "type": "issue",
-                                        "state": item.get("state"),
-                                        "score": item.get("score", 0),
-                                    },
-                                ))
-                    except httpx.HTTPError as e:
-                        save_log("WARNING", f"GitHub {search_type} search failed: {e}", source="github_client", component="search_client")
-                        continue
-                    except Exception as e:
-                        save_log("WARNING", f"GitHub {search_type} parsing failed: {e}", source="github_client", component="search_client")
-                        continue
+        docs: List[Document] = []
+        # Search across multiple types: code, repositories, and issues
+        search_types = [
+            ("code", f"{self.BASE_URL}/code", self._parse_code_item),
+            ("repositories", f"{self.BASE_URL}/repositories", self._parse_repo_item),
+            ("issues", f"{self.BASE_URL}/issues", self._parse_issue_item),
+        ]
+
+        client = _get_http_client("github", self._create_http_client)
+
+        # Reserve one rate-limit token per subquery before queueing for admission,
+        # so a throttled caller waits without holding a concurrency slot
+        try:
+            await _GITHUB_SEARCH_RATE.acquire("github", len(search_types))
+        except RateLimitError as e:
+            save_log("WARNING", f"GitHub search skipped: {e}", source="github_client", component="search_client")
+            return docs
+        # Subqueries whose request went out; the rest get their token refunded
+        sent = [0]
+
+        async def _one(search_type: str, endpoint: str) -> Tuple[str, Any]:
+            # Build query with sort for relevance
+            params = {
+                "q": query,
+                "per_page": max(3, max_results // 3),  # Split results across 3 types
+                "sort": "stars" if search_type == "repositories" else "relevance",
+            }
+            sent[0] += 1
+            try:
+                items = await _fetch_items(
+                    client, endpoint, stream_min_bytes=GITHUB_STREAM_MIN_BYTES, params=params
+                )
+            except Exception as e:
+                return search_type, e
+            return search_type, items
+
+        # Items (or the exception) per search type, for the subqueries that completed
+        fetched: Dict[str, Any] = {}
+
+        # Hold the admission slot for the HTTP fetches only; parsing happens after release
+        try:
+            async with self._admission:  # Enforce max 3 concurrent requests
+                # Issue all subqueries at once; they multiplex over one HTTP/2 connection
+                tasks = [asyncio.ensure_future(_one(t, u)) for t, u, _ in search_types]
+                try:
+                    # Stop as soon as the finished subqueries cover max_results
+                    item_count = 0
+                    for next_done in asyncio.as_completed(tasks):
+                        search_type, result = await next_done
+                        fetched[search_type] = result
+                        if not isinstance(result, BaseException):
+                            item_count += len(result)
+                            if item_count >= max_results:
+                                break
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    # Wait for cancelled subqueries to unwind so none outlives the admission slot
+                    await asyncio.gather(*tasks, return_exceptions=True)
+
+                # GitHub signals secondary rate limits with 403 as well as 429
+                results = fetched.values()
+                if any(
+                    isinstance(r, httpx.HTTPStatusError) and r.response.status_code in (403, 429)
+                    for r in results
+                ):
+                    await self._admission.backoff()
+                elif not any(isinstance(r, BaseException) for r in results):
+                    await self._admission.recover()
+        finally:
+            _GITHUB_SEARCH_RATE.refund(len(search_types) - sent[0])
+
+        # Assemble in the fixed type order (code, repositories, issues), skipping
+        # subqueries that were cancelled once enough results had arrived
+        for search_type, _, parse_item in search_types:
+            if search_type not in fetched:
+                continue
+            items = fetched[search_type]
+            if isinstance(items, httpx.HTTPError):
+                save_log("WARNING", f"GitHub {search_type} search failed: {items}", source="github_client", component="search_client")
+                continue
+            if isinstance(items, BaseException):
+                save_log("WARNING", f"GitHub {search_type} parsing failed: {items}", source="github_client", component="search_client")
+                continue
+            try:
+                for item in items:
+                    docs.append(parse_item(item))
+            except Exception as e:
+                save_log("WARNING", f"GitHub {search_type} parsing failed: {e}", source="github_client", component="search_client")
+                continue
 
         return docs[:max_results]  # Limit total results
 
+# Placeholder documents returned by OfficialDocsClient until a real docs API is wired in
+_SPARK_DOCS_PLACEHOLDER = {
+    "content": "Apache Spark documentation related to: {query}\n\nThis is a placeholder result. In a production environment, this would contain actual Spark documentation content.",
+    "title": "Apache Spark Documentation: {query}",
+    "source_type": "spark_docs",
+    "source_url": "https://spark.apache.org/docs/result-{query_hash}.html",
+}
+_GENERIC_DOCS_PLACEHOLDER = {
+    "content": "Documentation related to: {query}\n\nThis is a placeholder result. In a production environment, this would contain actual documentation content from various sources.",
+    "title": "Documentation Result: {query}",
+    "source_type": "official_doc",
+    "source_url": "https://example.com/docs/{query_hash}",
+}
+
 class OfficialDocsClient:
-    """Handles simple scraping of official documentation search results with rate limiting and retries.
+    """Handles official documentation search results.
     
     NOTE: This client returns placeholder results. In a production environment, 
     this would use a proper documentation search API."""
     
-    def __init__(self):
-        """Initialize the client with a semaphore for concurrency control."""
-        self._semaphore = asyncio.Semaphore(4)  # Max 4 concurrent doc scraping requests
-    
     async def search(self, query: str, max_results: int) -> List[Document]:
-        """Asynchronously search docs with rate limiting."""
-        async with self._semaphore:  # Enforce max 4 concurrent doc scraping ops
-            docs: List[Document] = []
-            
-            try:
-                # For Spark-specific queries, use placeholder approach
-                if "spark" in query.lower():
-                    # Simple placeholder approach for Spark docs with unique URL
-                    import hashlib
-                    query_hash = hashlib.md5(query.encode()).hexdigest()[:8]
-                    content = f"Apache Spark documentation related to: {query}\n\nThis is a placeholder result. In a production environment, this would contain actual Spark documentation content."
-                    docs.append(Document(
-                        content=content,
-                        title=f"Apache Spark Documentation: {query}",
-                        source_type="spark_docs",
-                        source_url=f"https://spark.apache.org/docs/result-{query_hash}.html",
-                        metadata={},
-                    ))
-                else:
-                    # Generic documentation search - return a placeholder document with unique URL
-                    # In a production environment, this would use a proper search API
-                    import hashlib
-                    query_hash = hashlib.md5(query.encode()).hexdigest()[:8]
-                    content = f"Documentation related to: {query}\n\nThis is a placeholder result. In a production environment, this would contain actual documentation content from various sources."
-                    docs.append(Document(
-                        content=content,
-                        title=f"Documentation Result: {query}",
-                        source_type="official_doc",
-                        source_url=f"https://example.com/docs/{query_hash}",
-                        metadata={},
-                    ))
-
-            except Exception as e:
-                save_log("ERROR", f"Official docs search failed: {e}", source="docs_client", component="search_client")
+        """Build placeholder docs results for a query.
+        
+        No network call is made, so there is no client or admission control to
+        go through; add both here once a real documentation API is used.
+        """
+        docs: List[Document] = []
+        
+        try:
+            # Stable (process-independent) hash keeps the placeholder URL unique per query
+            query_hash = hashlib.blake2b(query.encode(), digest_size=4).hexdigest()
+            # Spark-specific queries get a Spark docs placeholder, everything else a generic one
+            template = _SPARK_DOCS_PLACEHOLDER if "spark" in query.lower() else _GENERIC_DOCS_PLACEHOLDER
+            docs.append(Document(
+                content=template["content"].format(query=query),
+                title=template["title"].format(query=query),
+                source_type=template["source_type"],
+                source_url=template["source_url"].format(query_hash=query_hash),
+                metadata={},
+            ))
+        except Exception as e:
+            save_log("ERROR", f"Official docs search failed: {e}", source="docs_client", component="search_client")
 
         return docs
 
 
-# ==================== Caching Layer (LRU Cache) ====================
+# ==================== Caching Layer (TTL Cache) ====================
 # Cache search results to avoid repeated API calls for identical queries
 
 def _cache_key(source: str, query: str, max_results: int) -> str:
-    """Generate a cache key for a search query."""
-    key = f"{source}:{query}:{max_results}"
-    return hashlib.sha256(key.encode()).hexdigest()
+    """Generate a cache key for a search query.
+    
+    The in-memory cache keys on plain strings, so no digest is needed; the key
+    stays unambiguous because source has no ':' and max_results is the last field.
+    """
+    return f"{source}:{query}:{max_results}"
+
+
+def _search_key_func(source: str) -> Callable[..., str]:
+    """Build a key function so positional, keyword and default calls share a cache entry."""
+    def key_func(query: str, max_results: int = 5) -> str:
+        return _cache_key(source, query, max_results)
+    return key_func
 
 
 # Lazy instantiation of clients for caching (instantiate only when needed)
-_stackoverflow_client = None
-_github_client = None
-_official_docs_client = None
+_stackoverflow_client: Optional[StackOverflowClient] = None
+_github_client: Optional[GitHubClient] = None
+_official_docs_client: Optional[OfficialDocsClient] = None
 
-def _get_stackoverflow_client():
+def _get_stackoverflow_client() -> StackOverflowClient:
     """Get or create StackOverflow client."""
     global _stackoverflow_client
     if _stackoverflow_client is None:
         _stackoverflow_client = StackOverflowClient()
     return _stackoverflow_client
 
-def _get_github_client():
+def _get_github_client() -> GitHubClient:
     """Get or create GitHub client."""
     global _github_client
     if _github_client is None:
         _github_client = GitHubClient()
     return _github_client
 
-def _get_official_docs_client():
+def _get_official_docs_client() -> OfficialDocsClient:
     """Get or create Official Docs client."""
     global _official_docs_client
     if _official_docs_client is None:
@@ -348,85 +825,55 @@ def _get_official_docs_client():
     return _official_docs_client
 
 
-@cached(namespace="search", ttl=300)
-async def search_stackoverflow_cached(query: str, max_results: int = 5) -> tuple:
+@cached(namespace="search", ttl=300, key_func=_search_key_func("stackoverflow"))
+async def search_stackoverflow_cached(query: str, max_results: int = 5) -> List[Document]:
     """
     Cached wrapper for StackOverflow search.
     
-    Note: lru_cache doesn't work directly with async functions returning lists,
-    so we convert results to JSON-serializable tuples for caching.
+    Results are kept in the shared async TTL cache for 5 minutes, keyed on
+    (query, max_results). Documents are cached as-is and must not be mutated.
     """
     client = _get_stackoverflow_client()
-    docs = await client.search(query, max_results)
-    # Convert Document objects to tuples for caching
-    import json
-    return tuple((d.content, d.title, d.source_type, d.source_url, json.dumps(d.metadata)) for d in docs)
+    return await client.search(query, max_results)
 
 
-@cached(namespace="search", ttl=300)
-async def search_github_cached(query: str, max_results: int = 5) -> tuple:
+@cached(namespace="search", ttl=300, key_func=_search_key_func("github"))
+async def search_github_cached(query: str, max_results: int = 5) -> List[Document]:
     """
     Cached wrapper for GitHub search.
     
-    Note: lru_cache doesn't work directly with async functions returning lists,
-    so we convert results to JSON-serializable tuples for caching.
+    Results are kept in the shared async TTL cache for 5 minutes, keyed on
+    (query, max_results). Documents are cached as-is and must not be mutated.
     """
     client = _get_github_client()
-    docs = await client.search(query, max_results)
-    # Convert Document objects to tuples for caching
-    import json
-    return tuple((d.content, d.title, d.source_type, d.source_url, json.dumps(d.metadata)) for d in docs)
+    return await client.search(query, max_results)
 
 
-@cached(namespace="search", ttl=300)
-async def search_official_docs_cached(query: str, max_results: int = 5) -> tuple:
+@cached(namespace="search", ttl=300, key_func=_search_key_func("official_docs"))
+async def search_official_docs_cached(query: str, max_results: int = 5) -> List[Document]:
     """
     Cached wrapper for Official Docs search.
     
-    Note: lru_cache doesn't work directly with async functions returning lists,
-    so we convert results to JSON-serializable tuples for caching.
+    Results are kept in the shared async TTL cache for 5 minutes, keyed on
+    (query, max_results). Documents are cached as-is and must not be mutated.
     """
     client = _get_official_docs_client()
-    docs = await client.search(query, max_results)
-    # Convert Document objects to tuples for caching
-    import json
-    return tuple((d.content, d.title, d.source_type, d.source_url, json.dumps(d.metadata)) for d in docs)
-
-
-def _convert_cached_tuple_to_documents(cached_tuple: tuple) -> List[Document]:
-    """Convert cached tuple back to Document objects."""
-    import json
-    docs = []
-    for content, title, source_type, source_url, metadata_str in cached_tuple:
-        try:
-            metadata = json.loads(metadata_str)
-        except (json.JSONDecodeError, TypeError):
-            metadata = {}
-        docs.append(Document(
-            content=content,
-            title=title,
-            source_type=source_type,
-            source_url=source_url,
-            metadata=metadata
-        ))
-    return docs
+    return await client.search(query, max_results)
 
 
 # Cache statistics helper (for monitoring)
 def get_cache_info() -> Dict[str, Any]:
     """Get cache statistics for all cached search functions."""
     # Get global cache stats since individual decorated functions don't expose cache info
-    from backend.utils.caching import get_cache
     cache = get_cache()
     return {
         "global_cache_stats": cache.get_stats()
     }
 
 
-def clear_all_caches():
+def clear_all_caches() -> None:
     """Clear all search result caches."""
     # Clear the search namespace in the global cache
-    from backend.utils.caching import get_cache
     cache = get_cache()
     cache.clear(namespace="search")
     save_log("INFO", "All search caches cleared", component="cache")
\ No newline at end of file
@@ -6,11 +6,14 @@ the vector database for RAG (Retrieval-Augmented Generation).
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from fastapi import HTTPException
+from postgrest.exceptions import APIError as PostgrestAPIError
 
 # Import the search clients and vector service
-from backend.services.search_clients import StackOverflowClient, GitHubClient, OfficialDocsClient, Document, search_stackoverflow_cached, search_github_cached, search_official_docs_cached, _convert_cached_tuple_to_documents
+from backend.services.search_clients import StackOverflowClient, GitHubClient, OfficialDocsClient, Document, search_stackoverflow_cached, search_github_cached, search_official_docs_cached
 from backend.services.vector_service import VectorStoreService
 from backend.utils.query_processing import preprocess_search_query
 
@@ -19,6 +22,19 @@ logger = logging.getLogger(__name__)
 class SearchService:
     """Main search service that orchestrates searches across multiple sources."""
     
+    # Time budget for a source="all" search; sources still running after it are dropped
+    ALL_SOURCES_TIMEOUT = 5.0
+    
+    # Source name -> (cached search function, log label, prefix added to the query),
+    # in the order source="all" results are returned
+    _SOURCE_SEARCHES = {
+        "stackoverflow": (search_stackoverflow_cached, "StackOverflow", ""),
+        "github": (search_github_cached, "GitHub", ""),
+        "official_doc": (search_official_docs_cached, "official docs", ""),
+        # Modify query to specifically target Spark documentation
+        "spark_docs": (search_official_docs_cached, "Spark docs", "spark "),
+    }
+    
     def __init__(self, openai_client=None, supabase_client=None):
         """Initialize search service with clients.
         
@@ -36,6 +52,38 @@ class SearchService:
         else:
             self.vector_service = None
             logger.warning("VectorStoreService is disabled due to missing clients")
+        
+        # TTL/LRU cache of smart_search responses, so repeated queries skip the
+        # source fetches and the embedding/upsert round-trips entirely
+        self._result_cache: "OrderedDict[tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._result_cache_max = 512
+        self._result_cache_ttl = 300.0
+    
+    async def _search_source(
+        self,
+        source: str,
+        query: str,
+        max_results: int
+    ) -> Tuple[List[Document], bool]:
+        """Run a cached source search, logging and swallowing failures.
+        
+        Args:
+            source: Key of the source in ``_SOURCE_SEARCHES``
+            query: Search query as given by the caller
+            max_results: Maximum number of results to return
+            
+        Returns:
+            Tuple of (documents, completed); documents are empty and completed
+            is False when the search failed
+        """
+        search_fn, label, prefix = self._SOURCE_SEARCHES[source]
+        try:
+            docs = await search_fn(prefix + query, max_results)
+            logger.info(f"Found {len(docs)} {label} results for query: {query[:50]}...")
+            return docs, True
+        except Exception as e:
+            logger.error(f"Error searching {label}: {e}")
+            return [], False
     
     async def search_stackoverflow(self, query: str, max_results: int = 5) -> List[Document]:
         """Search StackOverflow for relevant results.
@@ -47,14 +95,8 @@ class SearchService:
         Returns:
             List of Document objects
         """
-        try:
-            cached_results = await search_stackoverflow_cached(query, max_results)
-            docs = _convert_cached_tuple_to_documents(cached_results)
-            logger.info(f"Found {len(docs)} StackOverflow results for query: {query[:50]}...")
-            return docs
-        except Exception as e:
-            logger.error(f"Error searching StackOverflow: {e}")
-            return []
+        docs, _ = await self._search_source("stackoverflow", query, max_results)
+        return docs
     
     async def search_github(self, query: str, max_results: int = 5) -> List[Document]:
         """Search GitHub for relevant results.
@@ -66,14 +108,8 @@ class SearchService:
         Returns:
             List of Document objects
         """
-        try:
-            cached_results = await search_github_cached(query, max_results)
-            docs = _convert_cached_tuple_to_documents(cached_results)
-            logger.info(f"Found {len(docs)} GitHub results for query: {query[:50]}...")
-            return docs
-        except Exception as e:
-            logger.error(f"Error searching GitHub: {e}")
-            return []
+        docs, _ = await self._search_source("github", query, max_results)
+        return docs
     
     async def search_spark_docs(self, query: str, max_results: int = 5) -> List[Document]:
         """Search Apache Spark documentation for relevant results.
@@ -85,16 +121,8 @@ class SearchService:
         Returns:
             List of Document objects
         """
-        try:
-            # Modify query to specifically target Spark documentation
-            spark_query = f"spark {query}"
-            cached_results = await search_official_docs_cached(spark_query, max_results)
-            docs = _convert_cached_tuple_to_documents(cached_results)
-            logger.info(f"Found {len(docs)} Spark docs results for query: {query[:50]}...")
-            return docs
-        except Exception as e:
-            logger.error(f"Error searching Spark docs: {e}")
-            return []
+        docs, _ = await self._search_source("spark_docs", query, max_results)
+        return docs
     
     async def search_official_docs(self, query: str, max_results: int = 5) -> List[Document]:
         """Search official documentation for relevant results.
@@ -106,14 +134,68 @@ class SearchService:
         Returns:
             List of Document objects
         """
+        docs, _ = await self._search_source("official_doc", query, max_results)
+        return docs
+    
+    async def _search_all_sources(self, query: str, max_results: int) -> Tuple[List[Document], bool]:
+        """Search every source concurrently, returning once enough results are in.
+        
+        Results are ranked by source order, so the remaining searches are only
+        cancelled once every higher-priority source has finished and those
+        sources alone already supply ``max_results`` unique documents. Searches
+        still running when the ``ALL_SOURCES_TIMEOUT`` budget runs out are
+        cancelled instead of holding up the response.
+        
+        Args:
+            query: Processed search query
+            max_results: Maximum number of results the caller will keep
+            
+        Returns:
+            Tuple of (documents in fixed source order, complete). ``complete`` is
+            False if a source failed or any search was cancelled.
+        """
+        async def _indexed(index: int, source: str) -> Tuple[int, List[Document], bool]:
+            docs, ok = await self._search_source(source, query, max_results)
+            return index, docs, ok
+        
+        tasks = [
+            asyncio.ensure_future(_indexed(i, source))
+            for i, source in enumerate(self._SOURCE_SEARCHES)
+        ]
+        results: List[List[Document]] = [[] for _ in tasks]
+        finished = [False] * len(tasks)
+        # Unique URLs from the finished prefix of sources, and where that prefix ends
+        prefix_urls = set()
+        prefix_end = 0
+        complete = True
         try:
-            cached_results = await search_official_docs_cached(query, max_results)
-            docs = _convert_cached_tuple_to_documents(cached_results)
-            logger.info(f"Found {len(docs)} official docs results for query: {query[:50]}...")
-            return docs
-        except Exception as e:
-            logger.error(f"Error searching official docs: {e}")
-            return []
+            for next_done in asyncio.as_completed(tasks, timeout=self.ALL_SOURCES_TIMEOUT):
+                try:
+                    index, docs, ok = await next_done
+                except asyncio.TimeoutError:
+                    logger.warning(f"Source searches exceeded {self.ALL_SOURCES_TIMEOUT}s, using partial results")
+                    complete = False
+                    break
+                except Exception as e:
+                    logger.warning(f"Search task failed: {e}")
+                    complete = False
+                    continue
+                results[index] = docs
+                finished[index] = True
+                complete = complete and ok
+                while prefix_end < len(tasks) and finished[prefix_end]:
+                    prefix_urls.update(doc.source_url for doc in results[prefix_end] if doc.source_url)
+                    prefix_end += 1
+                if len(prefix_urls) >= max_results:
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    complete = False
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return [doc for docs in results for doc in docs], complete
     
     async def smart_search(
         self,
@@ -133,54 +215,39 @@ class SearchService:
         """
         # Preprocess query to optimize search effectiveness
         processed_query = preprocess_search_query(query)
-        logger.info(f"Performing smart search: '{query[:50]}...' -> '{processed_query[:50]}...' (source: {source})")
         
-        # Collect documents from specified sources
-        all_docs = []
+        # Key on the processed query: different raw error messages that reduce to the
+        # same search terms return the same results
+        key = (processed_query, source, max_results)
+        now = time.monotonic()
+        cached = self._result_cache.get(key)
+        if cached and now - cached[0] < self._result_cache_ttl:
+            self._result_cache.move_to_end(key)
+            logger.debug(f"Smart search cache hit: {query[:50]}...")
+            return {**cached[1], "query": query}
+        
+        logger.info(f"Performing smart search: '{query[:50]}...' -> '{processed_query[:50]}...' (source: {source})")
         
         try:
-            if source == "stackoverflow":
-                docs = await self.search_stackoverflow(processed_query, max_results)
-                all_docs.extend(docs)
-            elif source == "github":
-                docs = await self.search_github(processed_query, max_results)
-                all_docs.extend(docs)
-            elif source == "official_doc":
-                docs = await self.search_official_docs(processed_query, max_results)
-                all_docs.extend(docs)
-            elif source == "spark_docs":
-                docs = await self.search_spark_docs(processed_query, max_results)
-                all_docs.extend(docs)
-            elif source == "all":
+            # Collect documents from specified sources
+            if source == "all":
                 # Search all sources concurrently
-                tasks = [
-                    self.search_stackoverflow(processed_query, max_results),
-                    self.search_github(processed_query, max_results),
-                    self.search_official_docs(processed_query, max_results),
-                    self.search_spark_docs(processed_query, max_results)
-                ]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Process results
-                for result in results:
-                    if isinstance(result, Exception):
-                        logger.warning(f"Search task failed: {result}")
-                        continue
-                    if isinstance(result, list):
-                        all_docs.extend(result)
+                all_docs, complete = await self._search_all_sources(processed_query, max_results)
+            elif source in self._SOURCE_SEARCHES:
+                all_docs, complete = await self._search_source(source, processed_query, max_results)
             else:
                 raise ValueError(f"Invalid source: {source}")
             
-            # Deduplicate results by URL
+            # Deduplicate results by URL, stopping once max_results are collected
             seen_urls = set()
             unique_docs = []
             for doc in all_docs:
-                if doc.source_url and doc.source_url not in seen_urls:
-                    seen_urls.add(doc.source_url)
+                url = doc.source_url
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
                     unique_docs.append(doc)
-            
-            # Limit to max_results
-            unique_docs = unique_docs[:max_results]
+                    if len(unique_docs) >= max_results:
+                        break
             
             # Upsert documents to vector database if vector service is available
             if self.vector_service and unique_docs:
@@ -203,7 +270,7 @@ class SearchService:
             
             logger.info(f"Smart search completed with {len(formatted_results)} results")
             
-            return {
+            result = {
                 "results": formatted_results,
                 "query": query,
                 "processed_query": processed_query,
@@ -212,6 +279,16 @@ class SearchService:
                 "message": f"Found {len(formatted_results)} results from {source}"
             }
             
+            # Only cache complete answers; a failed or timed-out source, or an empty
+            # result, should be retried on the next request rather than replayed
+            if complete and formatted_results:
+                self._result_cache[key] = (now, result)
+                self._result_cache.move_to_end(key)
+                if len(self._result_cache) > self._result_cache_max:
+                    self._result_cache.popitem(last=False)
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Error during smart search: {e}")
             raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
@@ -240,44 +317,55 @@ class SearchService:
         
         try:
             # Generate embedding for the processed query
-            embeddings = await self.vector_service._generate_embeddings_async([processed_query])
-            if not embeddings:
+            query_embedding = await self.vector_service.embed_query_async(processed_query)
+            if not query_embedding:
                 raise HTTPException(status_code=500, detail="Failed to generate query embedding")
             
-            query_embedding = embeddings[0]
-            
             # Search in Supabase knowledge base
             self.vector_service._ensure_supabase()
             
-            # Build the query
-            query_builder = self.vector_service.supabase.table(VectorStoreService.KNOWLEDGE_BASE_TABLE)
-            
-            # Add source filter if specified
-            if source:
-                query_builder = query_builder.eq("source_type", source)
-            
-            # Perform vector similarity search using RPC function
+            # Perform vector similarity search using RPC function; ranking and the
+            # source filter run in Postgres against the pgvector index
             # Note: This assumes pgvector extension is installed and configured
             rpc_params = {
                 'query_embedding': query_embedding,
-                'match_count': max_results
+                'match_count': max_results,
+                # Only a 500-char preview is returned; fetch one extra char so the
+                # truncation below still knows to add the ellipsis
+                'content_chars': 501
             }
             
             # Add source filter if specified
             if source:
                 rpc_params['filter_source'] = source
             
-            response = self.vector_service.supabase.rpc('match_documents', rpc_params).execute()
+            # Run the blocking Supabase call in the executor, as VectorStoreService does
+            loop = asyncio.get_event_loop()
+            
+            def _match_documents(params: Dict[str, Any]):
+                return self.vector_service.supabase.rpc('match_documents', params).execute()
+            
+            try:
+                response = await loop.run_in_executor(None, _match_documents, rpc_params)
+            except PostgrestAPIError as e:
+                # Databases still on the older match_documents signature reject content_chars
+                # with PGRST202 (no function matches the arguments); anything else is a real error
+                if e.code != 'PGRST202':
+                    raise
+                logger.warning(f"match_documents with content_chars failed, retrying without it: {e}")
+                rpc_params.pop('content_chars')
+                response = await loop.run_in_executor(None, _match_documents, rpc_params)
             
             # Format results
             results = []
             if response.data:
                 for item in response.data:
+                    content = item.get("content") or ""
                     results.append({
                         "title": item.get("title", ""),
                         "url": item.get("source_url", ""),
                         "source": item.get("source_type", ""),
-                        "content": item.get("content", "")[:500] + "..." if len(item.get("content", "")) > 500 else item.get("content", ""),
+                        "content": content[:500] + "..." if len(content) > 500 else content,
                         "similarity_score": item.get("similarity", 0)  # Cosine similarity from pgvector
                     })
             
@@ -2,7 +2,7 @@
 
 import asyncio
 import hashlib
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, Set, Tuple, TYPE_CHECKING
 from openai import OpenAIError, RateLimitError, APIError, APIConnectionError
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
@@ -17,19 +17,36 @@ except ImportError:
     def save_log(level: str, message: str, source: str = "search", component: str = "vector_service"):
         print(f"[{level}] {source}/{component}: {message}")
 
+from backend.utils.caching import single_flight
+
 if TYPE_CHECKING:
     from backend.services.search_clients import Document  # For type hinting only
 
+def _content_hashes(contents: List[str]) -> List[str]:
+    """SHA-256 hex digests used as knowledge_base content_hash keys."""
+    return [hashlib.sha256(c.encode("utf-8")).hexdigest() for c in contents]
+
 class VectorStoreService:
     """Handles embedding generation and upsert operations into Supabase."""
 
     EMBEDDING_MODEL = "text-embedding-3-small"
     KNOWLEDGE_BASE_TABLE = "knowledge_base"
+    EMBEDDING_CONCURRENCY = 4  # Embedding batch requests in flight at once
+    UPSERT_BATCH_SIZE = 32  # Rows per Supabase upsert request
+    UPSERT_CONCURRENCY = 2  # Upsert requests in flight at once
+    EMBED_BATCH_WINDOW = 0.005  # Seconds to collect concurrent query embeddings into one request
+    HASH_IN_THREAD_MIN_CHARS = 1_000_000  # Total content size above which hashing moves to a thread
+    HASH_LOOKUP_CHUNK_SIZE = 50  # Content hashes per existing-row lookup (sent in the URL)
 
     def __init__(self, openai_client: Any, supabase_client: Any):
+        """Initialize with an OpenAI client (sync ``OpenAI`` or ``AsyncOpenAI``) and a Supabase client."""
         self.openai_client = openai_client
         self.supabase = supabase_client
         
+        # Query embeddings waiting for the current micro-batch window to close
+        self._embed_pending: List[Tuple[str, "asyncio.Future"]] = []
+        self._embed_batches: Set["asyncio.Task"] = set()
+        
     def _ensure_supabase(self):
         if not self.supabase:
             raise RuntimeError("Supabase client is not configured for VectorStoreService")
@@ -47,35 +64,43 @@ class VectorStoreService:
     async def _generate_embeddings_async(self, contents: List[str]) -> Optional[List[List[float]]]:
         """Call OpenAI to generate embeddings asynchronously with batching and exponential backoff.
         
-        Batches large requests into chunks of 100 to avoid rate limits.
+        Batches large requests into chunks of 100 to avoid rate limits, running up to
+        EMBEDDING_CONCURRENCY batches at once; embeddings come back in input order.
         Automatically retries on rate limit / API errors with exponential backoff.
         """
         self._ensure_openai()
         try:
             BATCH_SIZE = 100  # Safe for OpenAI rate limits
-            all_embeddings = []
+            batches = [contents[i:i + BATCH_SIZE] for i in range(0, len(contents), BATCH_SIZE)]
+            loop = asyncio.get_event_loop()
+            semaphore = asyncio.Semaphore(self.EMBEDDING_CONCURRENCY)
             
-            # Process in batches to avoid rate limiting
-            for i in range(0, len(contents), BATCH_SIZE):
-                batch = contents[i:i + BATCH_SIZE]
-                loop = asyncio.get_event_loop()
-                
-                # Run OpenAI call in executor to avoid blocking
-                emb_response = await loop.run_in_executor(
-                    None,
-                    lambda b=batch: self.openai_client.embeddings.create(
-                        model=self.EMBEDDING_MODEL, 
-                        input=b
-                    )
-                )
-                all_embeddings.extend([it.embedding for it in emb_response.data])
-                
+            create = self.openai_client.embeddings.create
+            is_async_client = asyncio.iscoroutinefunction(create)
+            
+            async def _embed_batch(index: int, batch: List[str]):
+                async with semaphore:
+                    if is_async_client:
+                        # AsyncOpenAI awaits its own HTTP transport directly
+                        emb_response = await create(model=self.EMBEDDING_MODEL, input=batch)
+                    else:
+                        # Run sync OpenAI call in executor to avoid blocking
+                        emb_response = await loop.run_in_executor(
+                            None,
+                            lambda: create(
+                                model=self.EMBEDDING_MODEL, 
+                                input=batch
+                            )
+                        )
                 # Log batch completion
-                if i + BATCH_SIZE < len(contents):
-                    save_log("DEBUG", f"Processed batch {i // BATCH_SIZE + 1}/{(len(contents) + BATCH_SIZE - 1) // BATCH_SIZE}", 
+                if len(batches) > 1:
+                    save_log("DEBUG", f"Processed batch {index + 1}/{len(batches)}", 
                              source="vector_service", component="embeddings")
+                return emb_response
             
-            return all_embeddings
+            # Batches are independent, so issue them concurrently (bounded) instead of one by one
+            responses = await asyncio.gather(*(_embed_batch(i, b) for i, b in enumerate(batches)))
+            return [it.embedding for emb_response in responses for it in emb_response.data]
         except (RateLimitError, APIError, APIConnectionError) as e:
             save_log("ERROR", f"OpenAI API error (will retry): {e}", source="vector_service", component="embeddings")
             raise  # Re-raise for tenacity retry logic
@@ -83,6 +108,59 @@ class VectorStoreService:
             save_log("ERROR", f"Failed to generate embeddings: {e}", source="vector_service", component="embeddings")
             return None
 
+    async def embed_query_async(self, query: str) -> Optional[List[float]]:
+        """Generate the embedding for a single search query.
+        
+        Concurrent calls for the same query share one embedding, and different
+        queries arriving within a few milliseconds share one OpenAI request.
+        
+        Args:
+            query: Query text to embed
+            
+        Returns:
+            Embedding vector, or None if generation failed
+        """
+        return await single_flight(
+            f"embedding:{self.EMBEDDING_MODEL}:{query}",
+            lambda: self._embed_in_batch(query)
+        )
+
+    async def _embed_in_batch(self, query: str) -> Optional[List[float]]:
+        """Queue a query for the next embeddings request.
+        
+        The first query opens a short EMBED_BATCH_WINDOW; every query queued
+        before it closes goes out in the same OpenAI request.
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        if not self._embed_pending:
+            loop.call_later(self.EMBED_BATCH_WINDOW, self._flush_embed_batch)
+        self._embed_pending.append((query, future))
+        return await future
+
+    def _flush_embed_batch(self) -> None:
+        """Close the micro-batch window and send the queued queries."""
+        pending, self._embed_pending = self._embed_pending, []
+        task = asyncio.ensure_future(self._run_embed_batch(pending))
+        # Keep a reference until the batch is done so it is not garbage collected
+        self._embed_batches.add(task)
+        task.add_done_callback(self._embed_batches.discard)
+
+    async def _run_embed_batch(self, pending: List[Tuple[str, "asyncio.Future"]]) -> None:
+        """Embed a closed micro-batch and resolve each caller's future."""
+        queries = [q for q, _ in pending]
+        try:
+            embeddings = await self._generate_embeddings_async(queries)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for i, (_, future) in enumerate(pending):
+            if not future.done():  # The caller may have been cancelled meanwhile
+                future.set_result(embeddings[i] if embeddings else None)
+
     async def _upsert_impl_async(self, docs: List['Document']) -> Dict[str, Any]:
         """Internal async implementation: Generate embeddings and upsert documents to knowledge base."""
         try:
@@ -93,7 +171,31 @@ class VectorStoreService:
         if not docs:
             return {"results": [], "message": "No documents to upsert."}
 
-        contents = [d.content for d in docs]
+        # Hash first so content already in the knowledge base is not embedded again;
+        # big batches are hashed off the event loop (hashlib releases the GIL)
+        doc_contents = [d.content for d in docs]
+        if sum(map(len, doc_contents)) >= self.HASH_IN_THREAD_MIN_CHARS:
+            hashes = await asyncio.to_thread(_content_hashes, doc_contents)
+        else:
+            hashes = _content_hashes(doc_contents)
+        existing_rows = await self._fetch_existing_rows_async(hashes)
+        
+        seen_hashes = {r.get("content_hash") for r in existing_rows}
+        new_docs = []
+        for doc, content_hash in zip(docs, hashes):
+            if content_hash not in seen_hashes:  # Also drops repeats within this call
+                seen_hashes.add(content_hash)
+                new_docs.append((doc, content_hash))
+        
+        if not new_docs:
+            save_log("INFO", f"All {len(docs)} docs already in knowledge_base, skipping embeddings", 
+                     source="vector_service", component="upsert")
+            return {
+                "results": [self._row_result(r) for r in existing_rows],
+                "message": f"All {len(docs)} docs already in knowledge_base."
+            }
+        
+        contents = [d.content for d, _ in new_docs]
         embeddings = await self._generate_embeddings_async(contents)
         
         if not embeddings:
@@ -101,8 +203,7 @@ class VectorStoreService:
             
         # Prepare rows for upsert
         rows = []
-        for doc, emb in zip(docs, embeddings):
-            content_hash = hashlib.sha256(doc.content.encode("utf-8")).hexdigest()
+        for (doc, content_hash), emb in zip(new_docs, embeddings):
             rows.append({
                 "content": doc.content,
                 "content_hash": content_hash,
@@ -113,18 +214,28 @@ class VectorStoreService:
                 "metadata": doc.metadata,
             })
             
-        # Upsert into Supabase asynchronously
+        # Upsert into Supabase asynchronously, in bounded batches with limited parallelism
+        loop = asyncio.get_event_loop()
+        semaphore = asyncio.Semaphore(self.UPSERT_CONCURRENCY)
+        
+        async def _upsert_batch(batch: List[Dict[str, Any]]):
+            async with semaphore:
+                return await loop.run_in_executor(
+                    None,
+                    lambda: self.supabase.table(self.KNOWLEDGE_BASE_TABLE).upsert(
+                        batch, 
+                        on_conflict="content_hash"
+                    ).execute()
+                )
+        
         try:
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.supabase.table(self.KNOWLEDGE_BASE_TABLE).upsert(
-                    rows, 
-                    on_conflict="content_hash"
-                ).execute()
-            )
+            batch_size = self.UPSERT_BATCH_SIZE
+            responses = await asyncio.gather(*(
+                _upsert_batch(rows[i:i + batch_size]) for i in range(0, len(rows), batch_size)
+            ))
+            saved_rows = [r for response in responses if response.data for r in response.data]
             
-            saved_count = len(result.data) if result.data else 0
+            saved_count = len(saved_rows)
             save_log("INFO", f"Saved {saved_count} docs to knowledge_base (Total: {len(rows)})", 
                      source="vector_service", component="upsert")
                      
@@ -133,30 +244,65 @@ class VectorStoreService:
             return {"error": str(e), "results": []}
 
         # Return results with data from Supabase response when available
-        if result.data:
+        results = [self._row_result(r) for r in existing_rows]
+        if saved_rows:
             # Use Supabase response data for more accurate results
-            results = [
-                {
-                    "id": r.get("id"),
-                    "title": r.get("title"), 
-                    "url": r.get("source_url"), 
-                    "score": r.get("metadata", {}).get("score"),
-                    "content_hash": r.get("content_hash")
-                } 
-                for r in result.data
-            ]
+            results.extend(self._row_result(r) for r in saved_rows)
         else:
             # Fallback to input-derived results if no data from Supabase
-            results = [
+            results.extend(
                 {
                     "title": r["title"], 
                     "url": r["source_url"], 
                     "score": r.get("metadata", {}).get("score")
                 } 
                 for r in rows
-            ]
+            )
+        
+        message = f"Cached {len(rows)} docs into knowledge_base."
+        if existing_rows:
+            message += f" {len(existing_rows)} already stored."
+        return {"results": results, "message": message}
+
+    @staticmethod
+    def _row_result(r: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a knowledge_base row as an upsert result entry."""
+        return {
+            "id": r.get("id"),
+            "title": r.get("title"), 
+            "url": r.get("source_url"), 
+            "score": (r.get("metadata") or {}).get("score"),
+            "content_hash": r.get("content_hash")
+        }
+
+    async def _fetch_existing_rows_async(self, hashes: List[str]) -> List[Dict[str, Any]]:
+        """Look up knowledge_base rows that already store any of the given content hashes.
+        
+        A failed lookup is logged and treated as "nothing stored", so the caller
+        falls back to embedding and upserting everything.
+        """
+        unique_hashes = list(dict.fromkeys(hashes))
         
-        return {"results": results, "message": f"Cached {len(rows)} docs into knowledge_base."}
+        def _lookup() -> List[Dict[str, Any]]:
+            rows = []
+            # The hashes travel in the request URL, so look them up in bounded chunks
+            for i in range(0, len(unique_hashes), self.HASH_LOOKUP_CHUNK_SIZE):
+                response = (
+                    self.supabase.table(self.KNOWLEDGE_BASE_TABLE)
+                    .select("id, title, source_url, metadata, content_hash")
+                    .in_("content_hash", unique_hashes[i:i + self.HASH_LOOKUP_CHUNK_SIZE])
+                    .execute()
+                )
+                rows.extend(response.data or [])
+            return rows
+        
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, _lookup)
+        except Exception as e:
+            save_log("WARNING", f"Existing content lookup failed, embedding all docs: {e}", 
+                     source="vector_service", component="upsert")
+            return []
 
     # Removed synchronous wrapper to avoid asyncio.run() issues in event loops
     # Use upsert_documents_async() instead
@@ -4,6 +4,7 @@ Tool handlers for search and knowledge base queries.
 """
 
 from typing import Optional, Dict, Any
+from backend.utils.query_processing import CONTEXT_TO_SOURCE, resolve_search_source
 from .base import BaseTool, ToolResult
 
 
@@ -45,27 +46,18 @@ class SmartSearchTool(BaseTool):
             )
         
         try:
-            # Map context to source if needed (maintain backward compatibility)
-            if source is None and context != "all":
-                source_mapping = {
-                    "error": "stackoverflow",
-                    "code_example": "github",
-                    "documentation": "official_doc",
-                    "best_practice": "official_doc"
-                }
-                source = source_mapping.get(context)
-            
             # Execute search using search service with correct parameter names
             results = await self.search_service.smart_search(
                 query=query,
-                source=source or "all",
+                source=resolve_search_source(context, source),
                 max_results=max_total_results  # Map max_total_results to max_results
             )
             
             data = {
                 "query": query,
                 "context": context,
-                "source": source,
+                # Explicit or context-implied source; None when all sources were searched
+                "source": source or CONTEXT_TO_SOURCE.get(context),
                 "results": results.get("results", []),
                 "total_results": results.get("total_results", 0)
             }
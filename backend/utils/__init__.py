@@ -8,6 +8,7 @@ from .caching import (
     get_cache,
     cache_key,
     cached,
+    single_flight,
     invalidate_cache,
     cache_response,
     cache_search,
@@ -42,6 +43,7 @@ __all__ = [
     'get_cache',
     'cache_key',
     'cached',
+    'single_flight',
     'invalidate_cache',
     'cache_response',
     'cache_search',
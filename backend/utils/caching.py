@@ -4,12 +4,13 @@ Caching utilities for expensive operations.
 Supports in-memory caching with TTL and optional Redis backend.
 """
 
+import asyncio
 import logging
 import hashlib
 import json
 import time
 import threading
-from typing import Any, Optional, Callable, Dict
+from typing import Any, Awaitable, Optional, Callable, Dict
 from functools import wraps
 from datetime import datetime, timedelta
 
@@ -247,8 +248,42 @@ def cache_key(func_name: str, *args, **kwargs) -> str:
     key_parts.extend([f"{k}={v}" for k, v in sorted(kwargs.items())])
     key_str = "|".join(key_parts)
     
-    # Hash for consistent key length
-    return hashlib.md5(key_str.encode()).hexdigest()
+    # Hash for consistent key length (blake2b: fast on short inputs, same 32-char hex as md5)
+    return hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
+
+
+# In-flight loads keyed by full cache key, shared by concurrent callers
+_inflight: Dict[str, "asyncio.Future"] = {}
+
+
+async def single_flight(key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+    """Run load() once per key among concurrent callers.
+    
+    The first caller starts the load; callers arriving while it is still
+    running await the same task instead of starting their own.
+    
+    Args:
+        key: Key identifying the operation
+        load: Zero-argument coroutine function performing the work
+        
+    Returns:
+        Result of the shared load
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(load())
+        _inflight[key] = task
+        
+        def _forget(done: "asyncio.Future") -> None:
+            if _inflight.get(key) is done:
+                del _inflight[key]
+        
+        task.add_done_callback(_forget)
+    else:
+        logger.debug(f"Joining in-flight load: {key}")
+    
+    # Shield so one cancelled caller does not cancel the load for the others
+    return await asyncio.shield(task)
 
 
 def cached(
@@ -289,14 +324,16 @@ def cached(
                 logger.debug(f"Cache hit for {func.__name__}")
                 return cached_value
             
-            # Execute function
+            # Execute function, coalescing concurrent misses for the same key
             logger.debug(f"Cache miss for {func.__name__}, executing...")
-            result = await func(*args, **kwargs)
             
-            # Cache result
-            cache.set(namespace, key, result, ttl)
+            async def load():
+                result = await func(*args, **kwargs)
+                # Cache result
+                cache.set(namespace, key, result, ttl)
+                return result
             
-            return result
+            return await single_flight(f"{namespace}:{key}", load)
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
@@ -324,7 +361,6 @@ def cached(
             return result
         
         # Return appropriate wrapper based on function type
-        import asyncio
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         else:
@@ -8,7 +8,7 @@ import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
-from backend.models.logging import LogBuilder, ChatMessageBuilder
+from backend.models.logging import LogBuilder, ChatMessageBuilder, LogLevel, ChatMessageRole
 from backend.utils.logging_sanitizer import sanitize_log_message
 # Import handle_exception with fallback
 try:
@@ -60,7 +60,6 @@ def save_log(
         
         # Create log entry using builder pattern
         # Map string level to LogLevel enum and use appropriate builder method
-        from backend.models.logging import LogLevel
         level_enum = LogLevel(level.upper()) if isinstance(level, str) else level
         
         if level_enum == LogLevel.ERROR:
@@ -221,7 +220,6 @@ def save_chat_message(
             
         # Create chat message entry using builder pattern
         # Map string role to ChatMessageRole enum and use appropriate builder method
-        from backend.models.logging import ChatMessageRole
         role_enum = ChatMessageRole(role.lower()) if isinstance(role, str) else role
         
         if role_enum == ChatMessageRole.USER:
@@ -4,12 +4,59 @@ Utilities for processing and optimizing search queries, especially for error mes
 """
 
 import re
+from functools import lru_cache
 from typing import Optional
 
+# Indicators matched against the lower-cased query, compiled into a single
+# alternation so the text is scanned once instead of once per indicator.
+_ERROR_INDICATORS = (
+    r'\.utils\.',  # Java/Python style error
+    r'Exception:',
+    r'Error:',
+    r'Traceback',
+    r'Caused by:',
+    r'at [a-zA-Z0-9_.]+\(',  # Stack trace lines
+    r'\[.*\]',  # Error codes in brackets
+    r'cannot be found',
+    r'not found',
+    r'does not exist',
+)
+_ERROR_INDICATOR_RE = re.compile('|'.join(f'(?:{p})' for p in _ERROR_INDICATORS))
+
+# Patterns used to pull search terms out of error messages
+_WHITESPACE_RE = re.compile(r'\s+')
+_EXCEPTION_TYPE_RE = re.compile(r'([a-zA-Z0-9_.]+Exception)')
+_ERROR_CODE_RE = re.compile(r'\[([^\]]+)\]')
+_QUOTED_TABLE_RE = re.compile(r'[`"\']([a-zA-Z0-9_]+\.?[a-zA-Z0-9_]*)[`"\']')
+_DOTTED_NAME_RE = re.compile(r'\b([a-zA-Z0-9_]+\.[a-zA-Z0-9_]+)\b')
+
+# Search context -> source searched when the caller gives no explicit source;
+# unmapped contexts (including "all") search every source
+CONTEXT_TO_SOURCE = {
+    "error": "stackoverflow",
+    "code_example": "github",
+    "documentation": "official_doc",
+    "best_practice": "official_doc",
+}
+
+def resolve_search_source(context: str, source: Optional[str] = None) -> str:
+    """Pick the source to search for a context.
+    
+    Args:
+        context: Context type (error, code_example, documentation, best_practice, all)
+        source: Explicit source restriction, which takes precedence over the context
+        
+    Returns:
+        Source name accepted by SearchService.smart_search
+    """
+    return source or CONTEXT_TO_SOURCE.get(context, "all")
+
+@lru_cache(maxsize=4096)
 def preprocess_search_query(query: str) -> str:
     """Preprocess search query to make it more effective for searching.
     
     For error messages, this extracts the essential parts and removes noise.
+    Results are memoized, since the same queries recur across searches.
     
     Args:
         query: Raw search query
@@ -29,21 +76,7 @@ def preprocess_search_query(query: str) -> str:
 
 def _looks_like_error_message(text: str) -> bool:
     """Check if text looks like an error message."""
-    error_indicators = [
-        r'\.utils\.',  # Java/Python style error
-        r'Exception:',
-        r'Error:',
-        r'Traceback',
-        r'Caused by:',
-        r'at [a-zA-Z0-9_.]+\(',  # Stack trace lines
-        r'\[.*\]',  # Error codes in brackets
-        r'cannot be found',
-        r'not found',
-        r'does not exist',
-    ]
-    
-    text_lower = text.lower()
-    return any(re.search(indicator, text_lower) for indicator in error_indicators)
+    return _ERROR_INDICATOR_RE.search(text.lower()) is not None
 
 def _extract_error_keywords(text: str) -> str:
     """Extract key keywords from error message for better search results."""
@@ -51,22 +84,23 @@ def _extract_error_keywords(text: str) -> str:
     # Strategy: Extract exception type and create generalized search terms
     
     # Clean up the text - remove extra whitespace
-    cleaned = re.sub(r'\s+', ' ', text).strip()
+    cleaned = _WHITESPACE_RE.sub(' ', text).strip()
+    cleaned_lower = cleaned.lower()
     
     # Extract exception type if present
-    exception_match = re.search(r'([a-zA-Z0-9_.]+Exception)', cleaned)
+    exception_match = _EXCEPTION_TYPE_RE.search(cleaned)
     exception_type = exception_match.group(1) if exception_match else None
     
     # Extract error code if present (text in brackets)
-    error_code_match = re.search(r'\[([^\]]+)\]', cleaned)
+    error_code_match = _ERROR_CODE_RE.search(cleaned)
     error_code = error_code_match.group(1) if error_code_match else None
     
     # For database errors, extract table/view names
-    table_match = re.search(r'[`"\']([a-zA-Z0-9_]+\.?[a-zA-Z0-9_]*)[`"\']', cleaned)
+    table_match = _QUOTED_TABLE_RE.search(cleaned)
     table_name = table_match.group(1) if table_match else None
     
     # Also look for table names without quotes
-    table_match_no_quotes = re.search(r'\b([a-zA-Z0-9_]+\.[a-zA-Z0-9_]+)\b', cleaned)
+    table_match_no_quotes = _DOTTED_NAME_RE.search(cleaned)
     if not table_name and table_match_no_quotes:
         table_name = table_match_no_quotes.group(1)
     
@@ -74,8 +108,8 @@ def _extract_error_keywords(text: str) -> str:
     candidates = []
     
     # Candidate 1: Generalized terms (most likely to succeed)
-    table_related = 'table' in cleaned.lower() or 'view' in cleaned.lower()
-    not_found_related = 'not found' in cleaned.lower() or 'cannot be found' in cleaned.lower()
+    table_related = 'table' in cleaned_lower or 'view' in cleaned_lower
+    not_found_related = 'not found' in cleaned_lower or 'cannot be found' in cleaned_lower
     
     if table_related and not_found_related:
         if exception_type and 'spark' in exception_type.lower():
@@ -108,13 +142,13 @@ def _extract_error_keywords(text: str) -> str:
         return candidates[0][:100].strip()
     else:
         # Fallback: clean up and truncate the original
-        result = re.sub(r'\s+', ' ', cleaned).strip()
+        result = _WHITESPACE_RE.sub(' ', cleaned).strip()
         return result[:100].strip()
 
 def _clean_regular_query(query: str) -> str:
     """Clean up regular search queries."""
     # Remove extra whitespace
-    cleaned = re.sub(r'\s+', ' ', query.strip())
+    cleaned = _WHITESPACE_RE.sub(' ', query.strip())
     
     # Limit length
     if len(cleaned) > 200:
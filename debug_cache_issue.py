@@ -33,8 +33,7 @@ async def debug_cache_issue():
         from backend.services.search_clients import (
             search_stackoverflow_cached,
             search_github_cached,
-            search_official_docs_cached,
-            _convert_cached_tuple_to_documents
+            search_official_docs_cached
         )
         
         # Test query
@@ -45,24 +44,21 @@ async def debug_cache_issue():
         
         # Test StackOverflow search
         logger.info("\n=== Testing StackOverflow cache ===")
-        so_results_tuple = await search_stackoverflow_cached(query, max_results)
-        so_results = _convert_cached_tuple_to_documents(so_results_tuple)
+        so_results = await search_stackoverflow_cached(query, max_results)
         logger.info(f"StackOverflow results count: {len(so_results)}")
         for i, result in enumerate(so_results):
             logger.info(f"  Result {i+1}: {result.title[:50]}... (source: {result.source_type})")
         
         # Test GitHub search
         logger.info("\n=== Testing GitHub cache ===")
-        gh_results_tuple = await search_github_cached(query, max_results)
-        gh_results = _convert_cached_tuple_to_documents(gh_results_tuple)
+        gh_results = await search_github_cached(query, max_results)
         logger.info(f"GitHub results count: {len(gh_results)}")
         for i, result in enumerate(gh_results):
             logger.info(f"  Result {i+1}: {result.title[:50]}... (source: {result.source_type})")
         
         # Test Official Docs search
         logger.info("\n=== Testing Official Docs cache ===")
-        docs_results_tuple = await search_official_docs_cached(query, max_results)
-        docs_results = _convert_cached_tuple_to_documents(docs_results_tuple)
+        docs_results = await search_official_docs_cached(query, max_results)
         logger.info(f"Official Docs results count: {len(docs_results)}")
         for i, result in enumerate(docs_results):
             logger.info(f"  Result {i+1}: {result.title[:50]}... (source: {result.source_type})")
@@ -73,16 +69,14 @@ async def debug_cache_issue():
         
         # Test StackOverflow search with different query
         logger.info("\n--- StackOverflow with 'spark exception' ---")
-        so_results2_tuple = await search_stackoverflow_cached(query2, max_results)
-        so_results2 = _convert_cached_tuple_to_documents(so_results2_tuple)
+        so_results2 = await search_stackoverflow_cached(query2, max_results)
         logger.info(f"StackOverflow results count: {len(so_results2)}")
         for i, result in enumerate(so_results2):
             logger.info(f"  Result {i+1}: {result.title[:50]}... (source: {result.source_type})")
             
         # Now test the original query again to see if cache is working
         logger.info("\n--- StackOverflow with 'python error' (again) ---")
-        so_results3_tuple = await search_stackoverflow_cached(query, max_results)
-        so_results3 = _convert_cached_tuple_to_documents(so_results3_tuple)
+        so_results3 = await search_stackoverflow_cached(query, max_results)
         logger.info(f"StackOverflow results count: {len(so_results3)}")
         for i, result in enumerate(so_results3):
             logger.info(f"  Result {i+1}: {result.title[:50]}... (source: {result.source_type})")
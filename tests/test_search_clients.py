@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Search client tests for the AI-Powered Data Pipeline Assistant.
+These run against an in-process mock transport, so no backend or network is needed.
+"""
+
+import os
+import sys
+import asyncio
+import unittest
+
+import httpx
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from backend.services import search_clients
+
+
+class StackOverflowConditionalRequestTestCase(unittest.TestCase):
+    """Test cases for the conditional GET (ETag) cache used by StackOverflowClient."""
+
+    ETAG = '"page-v1"'
+
+    def setUp(self):
+        """Start from empty shared clients and ETag cache."""
+        search_clients._http_clients.clear()
+        search_clients._etag_cache.clear()
+        self.if_none_match = []
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        """Serve one page of questions, answering 304 when the ETag matches."""
+        header = request.headers.get("If-None-Match")
+        self.if_none_match.append(header)
+        if header == self.ETAG:
+            return httpx.Response(304, headers={"ETag": self.ETAG})
+        pagesize = int(request.url.params["pagesize"])
+        items = [
+            {"title": f"Question {i}", "link": f"https://stackoverflow.com/q/{i}", "body": "<p>body</p>"}
+            for i in range(pagesize)
+        ]
+        return httpx.Response(200, json={"items": items}, headers={"ETag": self.ETAG})
+
+    def test_repeat_search_sends_if_none_match(self):
+        """Test that a repeated identical search is sent as a conditional request."""
+        client = search_clients.StackOverflowClient()
+        client._create_http_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(self._handler))
+
+        async def search_twice():
+            first = await client.search("spark executor lost", 3)
+            second = await client.search("spark executor lost", 3)
+            await search_clients.close_http_clients()
+            return first, second
+
+        first, second = asyncio.run(search_twice())
+
+        self.assertEqual(self.if_none_match, [None, self.ETAG])
+        self.assertEqual(len(first), 3)
+        self.assertEqual([doc.source_url for doc in second], [doc.source_url for doc in first])
+
+
+if __name__ == "__main__":
+    unittest.main()